@@ -10,6 +10,7 @@ from typing import Optional, Dict, Any
 import json
 
 from llamalot.models import ApplicationConfig
+from llamalot.utils.file_utils import atomic_write_text
 from llamalot.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -143,7 +144,7 @@ class ConfigurationManager:
         for key, value in kwargs.items():
             if hasattr(ui_prefs, key):
                 setattr(ui_prefs, key, value)
-                logger.debug(f"Updated UI preference {key} = {value}")
+                logger.debug("Updated UI preference %s = %s", key, value)
             else:
                 logger.warning(f"Unknown UI preference: {key}")
     
@@ -161,7 +162,7 @@ class ConfigurationManager:
         for key, value in kwargs.items():
             if hasattr(chat_defaults, key):
                 setattr(chat_defaults, key, value)
-                logger.debug(f"Updated chat default {key} = {value}")
+                logger.debug("Updated chat default %s = %s", key, value)
             else:
                 logger.warning(f"Unknown chat default: {key}")
     
@@ -179,7 +180,7 @@ class ConfigurationManager:
         for key, value in kwargs.items():
             if hasattr(embeddings_config, key):
                 setattr(embeddings_config, key, value)
-                logger.debug(f"Updated embeddings config {key} = {value}")
+                logger.debug("Updated embeddings config %s = %s", key, value)
             else:
                 logger.warning(f"Unknown embeddings config: {key}")
     
@@ -255,9 +256,9 @@ class ConfigurationManager:
             True if successful, False otherwise
         """
         try:
+            # Serialize once and write the whole document in a single call
             config_dict = self.config.to_dict()
-            with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(config_dict, f, indent=2, ensure_ascii=False)
+            atomic_write_text(export_path, json.dumps(config_dict, indent=2, ensure_ascii=False))
             
             logger.info(f"Configuration exported to {export_path}")
             return True
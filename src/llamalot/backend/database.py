@@ -9,17 +9,57 @@ import logging
 import json
 import sqlite3
 import threading
+import uuid
 from contextlib import contextmanager
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Generator, Tuple
 
-from llamalot.models import OllamaModel, ChatMessage, ChatConversation
+from llamalot.models import OllamaModel, ChatMessage, ChatConversation, ChatImage, MessageRole
 from llamalot.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+# Tables whose row counts are reported by DatabaseManager.get_database_stats
+_STATS_TABLES = ('models', 'conversations', 'messages', 'message_attachments', 'app_state')
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    """
+    Parse a stored ISO 8601 timestamp of cached model data.
+    
+    Missing or unparseable values fall back to the current time, so one bad
+    cache row never breaks loading the rest.
+    """
+    if value:
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            pass
+    return datetime.now()
+
+
+def _serialize_app_state_value(value: Any) -> Tuple[str, str]:
+    """
+    Serialize an application state value for storage.
+    
+    Returns:
+        Tuple of (serialized value, value type name)
+    """
+    if isinstance(value, bool):
+        return str(value).lower(), 'bool'
+    elif isinstance(value, int):
+        return str(value), 'int'
+    elif isinstance(value, float):
+        return str(value), 'float'
+    elif isinstance(value, (dict, list)):
+        return json.dumps(value), 'json'
+    else:
+        return str(value), 'string'
+
+
 class DatabaseError(Exception):
     """Base exception for database operations."""
     pass
@@ -46,14 +86,21 @@ class DatabaseManager:
         Initialize the database manager.
         
         Args:
-            db_path: Path to the SQLite database file
+            db_path: Path to the SQLite database file, or ":memory:" for an
+                in-memory database private to this manager and shared by all
+                of its thread connections
         """
         self.db_path = Path(db_path)
+        self.in_memory = str(db_path) == ":memory:"
+        # Thread connections open the same named shared-cache in-memory database,
+        # which lives as long as one of them stays open
+        self._memory_uri = f"file:llamalot-{uuid.uuid4().hex}?mode=memory&cache=shared" if self.in_memory else None
         self._lock = threading.RLock()
-        self._connection_pool = {}  # Thread-local connections
+        self._connection_pool: Dict[threading.Thread, sqlite3.Connection] = {}  # Thread-local connections
         
         # Ensure parent directory exists
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.in_memory:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
         logger.info(f"Database manager initialized: {self.db_path}")
         
@@ -67,23 +114,37 @@ class DatabaseManager:
         Returns:
             SQLite connection for the current thread
         """
-        thread_id = threading.get_ident()
-        
-        if thread_id not in self._connection_pool:
-            conn = sqlite3.connect(
-                str(self.db_path),
-                timeout=30.0,
-                isolation_level=None  # Autocommit mode
-            )
-            conn.row_factory = sqlite3.Row  # Enable dict-like access
-            conn.execute("PRAGMA foreign_keys = ON")
-            conn.execute("PRAGMA journal_mode = WAL")
-            conn.execute("PRAGMA synchronous = NORMAL")
-            
-            self._connection_pool[thread_id] = conn
-            logger.debug(f"Created new database connection for thread {thread_id}")
+        thread = threading.current_thread()
+        conn = self._connection_pool.get(thread)
+        
+        if conn is None:
+            with self._lock:
+                conn = sqlite3.connect(
+                    self._memory_uri if self.in_memory else str(self.db_path),
+                    timeout=30.0,
+                    isolation_level=None,  # Autocommit mode
+                    uri=self.in_memory
+                )
+                
+                # Release connections of finished threads. The pool is keyed by
+                # Thread object rather than thread id because ids are reused, and
+                # a connection must never be handed to a thread that didn't create it.
+                # This runs after connecting so an in-memory database always keeps
+                # an open connection
+                for finished in [t for t in self._connection_pool if not t.is_alive()]:
+                    del self._connection_pool[finished]
+                
+                conn.row_factory = sqlite3.Row  # Enable dict-like access
+                conn.execute("PRAGMA foreign_keys = ON")
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.execute("PRAGMA synchronous = NORMAL")
+                conn.execute("PRAGMA temp_store = MEMORY")  # Temporary tables and sort spills stay in RAM
+                conn.execute("PRAGMA cache_size = -16000")  # 16 MiB page cache per connection
+                
+                self._connection_pool[thread] = conn
+            logger.debug(f"Created new database connection for thread {thread.name}")
         
-        return self._connection_pool[thread_id]
+        return conn
     
     @contextmanager
     def transaction(self) -> Generator[sqlite3.Connection, None, None]:
@@ -430,7 +491,7 @@ class DatabaseManager:
                 model.details.parameter_size,
                 model.details.quantization_level,
                 model.model_info.architecture if model.model_info else None,  # Use architecture as modelfile
-                json.dumps(model.model_info.__dict__) if model.model_info else None,  # Store all info as JSON in parameters
+                json.dumps(asdict(model.model_info)) if model.model_info else None,  # Store all info as JSON in parameters
                 None,  # template - not available in ModelInfo
                 None,  # system - not available in ModelInfo
                 json.dumps(model.capabilities) if model.capabilities else None,  # Store capabilities as JSON
@@ -557,13 +618,7 @@ class DatabaseManager:
         """Convert database row to OllamaModel instance."""
         from llamalot.models.ollama_model import ModelDetails, ModelInfo
         
-        # Parse datetime
-        modified_at = datetime.now()  # Default to current time
-        if row['modified_at']:
-            try:
-                modified_at = datetime.fromisoformat(row['modified_at'])
-            except ValueError:
-                pass  # Keep default
+        modified_at = _parse_timestamp(row['modified_at'])
         
         # Create model details
         details = ModelDetails(
@@ -638,8 +693,7 @@ class DatabaseManager:
             conn.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation.conversation_id,))
             
             # Save messages
-            for i, message in enumerate(conversation.messages):
-                self._save_message(conn, message, conversation.conversation_id, i)
+            self._save_messages(conn, conversation.messages, conversation.conversation_id)
         
         logger.debug(f"Saved conversation to database: {conversation.conversation_id}")
     
@@ -662,6 +716,22 @@ class DatabaseManager:
         if not conv_row:
             return None
         
+        # Get the attachments of all messages in one query, grouped by message
+        images_by_message: Dict[str, List[ChatImage]] = {}
+        cursor = conn.execute("""
+            SELECT a.* FROM message_attachments a
+            JOIN messages m ON m.message_id = a.message_id
+            WHERE m.conversation_id = ? AND a.attachment_type = 'image'
+            ORDER BY a.rowid
+        """, (conversation_id,))
+        for att_row in cursor:
+            images_by_message.setdefault(att_row['message_id'], []).append(ChatImage(
+                data=att_row['data'],
+                filename=att_row['filename'],
+                mime_type=att_row['mime_type'],
+                size=att_row['size']
+            ))
+        
         # Get messages
         cursor = conn.execute("""
             SELECT * FROM messages 
@@ -669,10 +739,10 @@ class DatabaseManager:
             ORDER BY sequence_number
         """, (conversation_id,))
         
-        messages = []
-        for msg_row in cursor.fetchall():
-            message = self._row_to_message(msg_row)
-            messages.append(message)
+        messages = [
+            self._row_to_message(msg_row, images_by_message.get(msg_row['message_id'], []))
+            for msg_row in cursor
+        ]
         
         # Create conversation
         conversation = ChatConversation(
@@ -766,70 +836,57 @@ class DatabaseManager:
         logger.info(f"Cleared all conversation history: {count} conversations deleted")
         return count
     
-    def _save_message(self, conn: sqlite3.Connection, message: ChatMessage, conversation_id: str, sequence: int) -> None:
-        """Save a message to the database."""
-        message_id = message.message_id or f"{conversation_id}_msg_{sequence}"
-        
-        conn.execute("""
+    def _save_messages(self, conn: sqlite3.Connection, messages: List[ChatMessage], conversation_id: str) -> None:
+        """Save the messages of a conversation, and their attachments, in bulk."""
+        message_rows = []
+        attachment_rows = []
+        
+        for sequence, message in enumerate(messages):
+            message_id = message.message_id or f"{conversation_id}_msg_{sequence}"
+            message_rows.append((
+                message_id,
+                conversation_id,
+                message.role.value,
+                message.content,
+                message.model_name,
+                message.tokens_used,
+                message.generation_time,
+                message.timestamp.isoformat(),
+                message.error,
+                message.is_error,
+                sequence
+            ))
+            
+            # Attachments (images, etc.)
+            for i, image in enumerate(message.images):
+                attachment_rows.append((
+                    f"{message_id}_img_{i}",
+                    message_id,
+                    'image',
+                    image.data,
+                    image.filename,
+                    image.mime_type,
+                    image.size
+                ))
+        
+        conn.executemany("""
             INSERT OR REPLACE INTO messages (
                 message_id, conversation_id, role, content,
                 model_name, tokens_used, generation_time, timestamp,
                 error, is_error, sequence_number
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            message_id,
-            conversation_id,
-            message.role.value,
-            message.content,
-            message.model_name,
-            message.tokens_used,
-            message.generation_time,
-            message.timestamp.isoformat(),
-            message.error,
-            message.is_error,
-            sequence
-        ))
-        
-        # Save attachments (images, etc.)
-        for i, image in enumerate(message.images):
-            attachment_id = f"{message_id}_img_{i}"
-            conn.execute("""
+        """, message_rows)
+        
+        if attachment_rows:
+            conn.executemany("""
                 INSERT OR REPLACE INTO message_attachments (
                     attachment_id, message_id, attachment_type,
                     data, filename, mime_type, size
                 ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                attachment_id,
-                message_id,
-                'image',
-                image.data,
-                image.filename,
-                image.mime_type,
-                image.size
-            ))
+            """, attachment_rows)
     
-    def _row_to_message(self, row: sqlite3.Row) -> ChatMessage:
-        """Convert database row to ChatMessage instance."""
-        from llamalot.models.chat import MessageRole, ChatImage
-        
-        # Get attachments
-        conn = self._get_connection()
-        cursor = conn.execute(
-            "SELECT * FROM message_attachments WHERE message_id = ?",
-            (row['message_id'],)
-        )
-        
-        images = []
-        for att_row in cursor.fetchall():
-            if att_row['attachment_type'] == 'image':
-                image = ChatImage(
-                    data=att_row['data'],
-                    filename=att_row['filename'],
-                    mime_type=att_row['mime_type'],
-                    size=att_row['size']
-                )
-                images.append(image)
-        
+    def _row_to_message(self, row: sqlite3.Row, images: List[ChatImage]) -> ChatMessage:
+        """Convert database row and its prefetched images to a ChatMessage instance."""
         return ChatMessage(
             role=MessageRole(row['role']),
             content=row['content'],
@@ -853,24 +910,7 @@ class DatabaseManager:
             value: State value (will be serialized as needed)
             description: Optional description
         """
-        import json
-        
-        # Determine value type and serialize
-        if isinstance(value, bool):
-            value_str = str(value).lower()
-            value_type = 'bool'
-        elif isinstance(value, int):
-            value_str = str(value)
-            value_type = 'int'
-        elif isinstance(value, float):
-            value_str = str(value)
-            value_type = 'float'
-        elif isinstance(value, (dict, list)):
-            value_str = json.dumps(value)
-            value_type = 'json'
-        else:
-            value_str = str(value)
-            value_type = 'string'
+        value_str, value_type = _serialize_app_state_value(value)
         
         with self.transaction() as conn:
             conn.execute("""
@@ -880,6 +920,23 @@ class DatabaseManager:
         
         logger.debug(f"Set app state: {key} = {value}")
     
+    def set_app_state_many(self, items: Dict[str, Any]) -> None:
+        """
+        Set several application state values in a single transaction.
+        
+        Args:
+            items: Mapping of state keys to values (serialized as in set_app_state)
+        """
+        rows = [(key, *_serialize_app_state_value(value)) for key, value in items.items()]
+        
+        with self.transaction() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO app_state (key, value, value_type, description, updated_at)
+                VALUES (?, ?, ?, NULL, CURRENT_TIMESTAMP)
+            """, rows)
+        
+        logger.debug(f"Set {len(rows)} app state values")
+    
     def get_app_state(self, key: str, default: Any = None) -> Any:
         """
         Get application state value.
@@ -891,8 +948,6 @@ class DatabaseManager:
         Returns:
             State value or default
         """
-        import json
-        
         conn = self._get_connection()
         cursor = conn.execute("SELECT value, value_type FROM app_state WHERE key = ?", (key,))
         row = cursor.fetchone()
@@ -980,18 +1035,17 @@ class DatabaseManager:
         """
         conn = self._get_connection()
         
-        stats = {}
-        
-        # Table row counts
-        for table in ['models', 'conversations', 'messages', 'message_attachments', 'app_state']:
-            cursor = conn.execute(f"SELECT COUNT(*) as count FROM {table}")
-            stats[f"{table}_count"] = cursor.fetchone()['count']
-        
-        # Database file size
-        stats['file_size'] = self.db_path.stat().st_size if self.db_path.exists() else 0
+        # Table row counts, database size and schema version in a single statement;
+        # the size comes from SQLite's page count so it also works for in-memory databases
+        row = conn.execute(f"""
+            SELECT {', '.join(f'(SELECT COUNT(*) FROM {table}) AS {table}_count' for table in _STATS_TABLES)},
+                   (SELECT page_count FROM pragma_page_count())
+                       * (SELECT page_size FROM pragma_page_size()) AS file_size,
+                   (SELECT value FROM db_metadata WHERE key = 'schema_version') AS schema_version
+        """).fetchone()
         
-        # Schema version
-        stats['schema_version'] = self._get_schema_version()
+        stats = dict(row)
+        stats['schema_version'] = int(stats['schema_version'] or 0)
         
         return stats
     
@@ -999,23 +1053,23 @@ class DatabaseManager:
         """Close all database connections."""
         with self._lock:
             # Close all connections in the pool, handling thread safety
-            current_thread_id = threading.get_ident()
+            current_thread = threading.current_thread()
             closed_count = 0
             skipped_count = 0
             
-            for thread_id, conn in list(self._connection_pool.items()):
+            for thread, conn in list(self._connection_pool.items()):
                 try:
-                    if thread_id == current_thread_id:
+                    if thread is current_thread:
                         # Only close connections created in the current thread
                         conn.close()
                         closed_count += 1
-                        logger.debug(f"Closed database connection for current thread {thread_id}")
+                        logger.debug(f"Closed database connection for current thread {thread.name}")
                     else:
                         # Skip connections from other threads - they'll be cleaned up automatically
                         skipped_count += 1
-                        logger.debug(f"Skipped closing connection from different thread {thread_id}")
+                        logger.debug(f"Skipped closing connection from different thread {thread.name}")
                 except Exception as e:
-                    logger.debug(f"Error closing connection for thread {thread_id}: {e}")
+                    logger.debug(f"Error closing connection for thread {thread.name}: {e}")
                     
             self._connection_pool.clear()
         
@@ -111,32 +111,18 @@ class OllamaClient:
             logger.debug("Fetching model list from Ollama")
             response = self.client.list()
             
-            models = []
-            for model_data in response.get('models', []):
+            # Create basic models from list response
+            models = OllamaModel.from_tags_response(response.get('models', []))
+            
+            for model in models:
+                # Fetch actual capabilities from model info
                 try:
-                    # Create basic model from list response
-                    model = OllamaModel.from_list_response(model_data)
-                    
-                    # Fetch actual capabilities from model info
-                    try:
-                        capabilities = self.get_model_capabilities(model.name)
-                        model.capabilities = capabilities
-                        logger.debug(f"Loaded model: {model.name} with capabilities: {capabilities}")
-                    except Exception as e:
-                        logger.debug(f"Failed to get capabilities for {model.name}, using default: {e}")
-                        # Keep the capabilities detected from families as fallback
-                    
-                    models.append(model)
-                except ValueError as e:
-                    # This catches models with empty names - log at debug level since it's expected
-                    if "empty or invalid name" in str(e):
-                        logger.debug(f"Skipping model with invalid name: {e}")
-                    else:
-                        logger.warning(f"Failed to parse model data: {e}")
-                    continue
+                    capabilities = self.get_model_capabilities(model.name)
+                    model.capabilities = capabilities
+                    logger.debug(f"Loaded model: {model.name} with capabilities: {capabilities}")
                 except Exception as e:
-                    logger.warning(f"Failed to parse model data: {e}")
-                    continue
+                    logger.debug(f"Failed to get capabilities for {model.name}, using default: {e}")
+                    # Keep the capabilities detected from families as fallback
             
             logger.info(f"Successfully loaded {len(models)} models")
             return models
@@ -166,23 +152,9 @@ class OllamaClient:
             logger.debug("Fetching basic model list from Ollama")
             response = self.client.list()
             
-            models = []
-            for model_data in response.get('models', []):
-                try:
-                    # Create basic model from list response
-                    model = OllamaModel.from_list_response(model_data)
-                    # Don't fetch capabilities - leave them empty for now
-                    models.append(model)
-                except ValueError as e:
-                    # This catches models with empty names - log at debug level since it's expected
-                    if "empty or invalid name" in str(e):
-                        logger.debug(f"Skipping model with invalid name: {e}")
-                    else:
-                        logger.warning(f"Failed to parse model data: {e}")
-                    continue
-                except Exception as e:
-                    logger.warning(f"Failed to parse model data: {e}")
-                    continue
+            # Create basic models from list response
+            # Don't fetch capabilities - leave them empty for now
+            models = OllamaModel.from_tags_response(response.get('models', []))
             
             logger.info(f"Successfully loaded {len(models)} basic models")
             return models
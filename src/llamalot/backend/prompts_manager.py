@@ -289,28 +289,18 @@ class PromptsManager:
             # Load default configuration
             default_config = PromptsConfig.from_json_file(default_prompts_file)
             
-            # Add missing base prompts
-            for prompt_id, base_prompt in default_config.base_prompts.items():
-                if prompt_id not in self.config.base_prompts:
-                    self.config.base_prompts[prompt_id] = base_prompt
+            # Add missing base prompts (existing ids are left untouched)
+            for base_prompt in default_config.base_prompts.values():
+                if self.config.add_base_prompt(base_prompt):
                     added_counts['base'] += 1
                     logger.info(f"Added base prompt: {base_prompt.name}")
             
-            # Add missing extra prompts  
-            for prompt_id, extra_prompt in default_config.extra_prompts.items():
-                if prompt_id not in self.config.extra_prompts:
-                    self.config.extra_prompts[prompt_id] = extra_prompt
+            # Add missing extra prompts (existing ids are left untouched)
+            for extra_prompt in default_config.extra_prompts.values():
+                if self.config.add_extra_prompt(extra_prompt):
                     added_counts['extra'] += 1
                     logger.info(f"Added extra prompt: {extra_prompt.name}")
             
-            # Update categories
-            categories = set()
-            for prompt in self.config.base_prompts.values():
-                categories.add(prompt.category)
-            for prompt in self.config.extra_prompts.values():
-                categories.add(prompt.category)
-            self.config.categories = sorted(list(categories))
-            
             # Save the updated configuration
             if added_counts['base'] > 0 or added_counts['extra'] > 0:
                 self.save_config()
@@ -7,12 +7,12 @@ and process them in batch to generate text descriptions saved alongside each ima
 
 import wx
 import wx.lib.scrolledpanel
+import functools
 import os
 import subprocess
 import threading
 import asyncio
 from typing import List, Optional, Callable
-from pathlib import Path
 
 from llamalot.models.chat import ChatImage
 from llamalot.models.ollama_model import OllamaModel
@@ -21,6 +21,31 @@ from llamalot.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Prompt wildcard replaced with the content of the image's existing text file
+_DESCRIPTION_WILDCARD = '%description%'
+
+# Maximum number of characters of an existing text file substituted into a prompt
+_MAX_DESCRIPTION_CHARS = 64 * 1024
+
+
+@functools.lru_cache(maxsize=256)
+def _read_description(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Read the stripped content of an existing description file.
+    
+    The modification time and size are part of the cache key, so a file that
+    changes on disk (e.g. after a batch run appends to it) is read again.
+    Content beyond _MAX_DESCRIPTION_CHARS is dropped with a warning.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read(_MAX_DESCRIPTION_CHARS + 1)
+    
+    if len(content) > _MAX_DESCRIPTION_CHARS:
+        logger.warning(f"{path} is longer than {_MAX_DESCRIPTION_CHARS} characters, truncating %description%")
+        content = content[:_MAX_DESCRIPTION_CHARS]
+    
+    return content.strip()
+
 
 class BatchProcessingPanel(wx.lib.scrolledpanel.ScrolledPanel):
     """
@@ -676,12 +701,11 @@ class BatchProcessingPanel(wx.lib.scrolledpanel.ScrolledPanel):
                     response = self._generate_description(model, prompt, image)
                     
                     # Save to text file
-                    self._save_description(image, response)
+                    output_file = self._save_description(image, response)
                     
                     successful += 1
                     
                     # Update results with file path tracking
-                    output_file = self._get_output_filename(image)
                     result_msg = f"✅ {image.filename} -> Saved to: {output_file}"
                     self._append_result_with_file_path(result_msg, output_file)
                     
@@ -740,36 +764,34 @@ class BatchProcessingPanel(wx.lib.scrolledpanel.ScrolledPanel):
         Returns:
             The prompt with wildcards replaced by appropriate content
         """
-        processed_prompt = prompt
+        # Most prompts contain no wildcard at all; skip all work (and file access) for them
+        if _DESCRIPTION_WILDCARD not in prompt:
+            return prompt
         
-        # Handle %description% wildcard
-        if '%description%' in processed_prompt:
+        try:
+            # Get the path to the text file for this image (using read suffix if specified)
+            text_file_path = self._get_read_filename(image)
+            
             try:
-                # Get the path to the text file for this image (using read suffix if specified)
-                text_file_path = self._get_read_filename(image)
-                
-                if os.path.exists(text_file_path):
-                    # Read existing content
-                    with open(text_file_path, 'r', encoding='utf-8') as f:
-                        existing_content = f.read().strip()
-                    logger.info(f"Substituting %description% with content from {text_file_path}")
-                else:
-                    # File doesn't exist, substitute with empty string
-                    existing_content = ""
-                    logger.info(f"No existing file at {text_file_path}, substituting %description% with empty string")
-                
-                # Replace the wildcard
-                processed_prompt = processed_prompt.replace('%description%', existing_content)
-                
-            except Exception as e:
-                logger.warning(f"Error processing %description% wildcard: {e}")
-                # On error, just replace with empty string
-                processed_prompt = processed_prompt.replace('%description%', "")
+                # Read existing content; unchanged files are served from memory
+                stat = os.stat(text_file_path)
+                existing_content = _read_description(text_file_path, stat.st_mtime_ns, stat.st_size)
+                logger.debug(f"Substituting %description% with content from {text_file_path}")
+            except FileNotFoundError:
+                # File doesn't exist, substitute with empty string
+                existing_content = ""
+                logger.debug(f"No existing file at {text_file_path}, substituting %description% with empty string")
+            
+        except Exception as e:
+            logger.warning(f"Error processing %description% wildcard: {e}")
+            # On error, just replace with empty string
+            existing_content = ""
         
-        return processed_prompt
+        # Replace every occurrence of the wildcard in a single pass
+        return prompt.replace(_DESCRIPTION_WILDCARD, existing_content)
             
-    def _save_description(self, image: ChatImage, description: str) -> None:
-        """Save description to text file next to the image."""
+    def _save_description(self, image: ChatImage, description: str) -> str:
+        """Save description to text file next to the image and return its path."""
         try:
             output_path = self._get_output_filename(image)
             
@@ -784,78 +806,42 @@ class BatchProcessingPanel(wx.lib.scrolledpanel.ScrolledPanel):
             mode = 'a' if self.append_radio.GetValue() else 'w'
             
             with open(output_path, mode, encoding='utf-8') as f:
-                if mode == 'a' and os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+                if mode == 'a' and f.tell() > 0:
                     # Add a newline before appending if file already has content
+                    # (append mode opens positioned at the end of the file)
                     f.write('\n')
                 f.write(content)
                 
             action = "Appended to" if mode == 'a' else "Saved description to"
             logger.info(f"{action}: {output_path}")
+            return output_path
             
         except Exception as e:
             raise Exception(f"Failed to save description: {e}")
             
     def _get_output_filename(self, image: ChatImage) -> str:
         """Get the output text filename for an image with optional write suffix."""
-        write_suffix = self.write_suffix_text.GetValue().strip()
-        
-        if image.source_path:
-            # Use the original file path, change extension to .txt
-            path = Path(image.source_path)
-            base_name = path.stem
-            
-            # Add write suffix if provided
-            if write_suffix:
-                # Ensure suffix starts with underscore if it doesn't already
-                if not write_suffix.startswith('_'):
-                    write_suffix = '_' + write_suffix
-                base_name += write_suffix
-            
-            return str(path.parent / f"{base_name}.txt")
-        else:
-            # Fallback: save in current directory
-            filename = image.filename or "unknown"
-            base_name = Path(filename).stem
-            
-            # Add write suffix if provided
-            if write_suffix:
-                # Ensure suffix starts with underscore if it doesn't already
-                if not write_suffix.startswith('_'):
-                    write_suffix = '_' + write_suffix
-                base_name += write_suffix
-            
-            return f"{base_name}.txt"
+        return self._get_text_filename(image, self.write_suffix_text.GetValue().strip())
     
     def _get_read_filename(self, image: ChatImage) -> str:
         """Get the read text filename for an image with optional read suffix."""
-        read_suffix = self.read_suffix_text.GetValue().strip()
+        return self._get_text_filename(image, self.read_suffix_text.GetValue().strip())
+    
+    @staticmethod
+    def _get_text_filename(image: ChatImage, suffix: str) -> str:
+        """Get the .txt filename next to an image, with an optional suffix added to its stem."""
+        # Ensure suffix starts with underscore if it doesn't already
+        if suffix and not suffix.startswith('_'):
+            suffix = '_' + suffix
         
         if image.source_path:
             # Use the original file path, change extension to .txt
-            path = Path(image.source_path)
-            base_name = path.stem
-            
-            # Add read suffix if provided
-            if read_suffix:
-                # Ensure suffix starts with underscore if it doesn't already
-                if not read_suffix.startswith('_'):
-                    read_suffix = '_' + read_suffix
-                base_name += read_suffix
-            
-            return str(path.parent / f"{base_name}.txt")
+            base_path = os.path.splitext(image.source_path)[0]
         else:
-            # Fallback: check current directory
-            filename = image.filename or "unknown"
-            base_name = Path(filename).stem
-            
-            # Add read suffix if provided
-            if read_suffix:
-                # Ensure suffix starts with underscore if it doesn't already
-                if not read_suffix.startswith('_'):
-                    read_suffix = '_' + read_suffix
-                base_name += read_suffix
-            
-            return f"{base_name}.txt"
+            # Fallback: current directory
+            base_path = os.path.splitext(os.path.basename(image.filename or "unknown"))[0]
+        
+        return f"{base_path}{suffix}.txt"
             
     def _append_result_with_file_path(self, message: str, file_path: Optional[str]) -> None:
         """Append a result message and track file path for double-click functionality."""
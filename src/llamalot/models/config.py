@@ -4,14 +4,28 @@ Configuration data models for LlamaLot application.
 Handles application settings, preferences, and configuration management.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import json
 import os
+import sys
 
+from llamalot.utils.compat import DATACLASS_SLOTS
+from llamalot.utils.file_utils import atomic_write_text
 
-@dataclass
+
+# Platform-specific data directory, relative to the user's home directory.
+# sys.platform is a constant, so this is decided once at import time.
+if sys.platform == 'win32':  # Windows
+    _DATA_DIRECTORY_PARTS = ("AppData", "Local", "LlamaLot")
+elif sys.platform == 'darwin':  # macOS
+    _DATA_DIRECTORY_PARTS = ("Library", "Application Support", "LlamaLot")
+else:  # Linux and other Unix-like
+    _DATA_DIRECTORY_PARTS = (".llamalot",)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class OllamaServerConfig:
     """Configuration for Ollama server connection."""
     
@@ -42,7 +56,7 @@ class OllamaServerConfig:
         return None if self.timeout < 1 else self.timeout
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class UIPreferences:
     """User interface preferences and settings."""
     
@@ -76,7 +90,7 @@ class UIPreferences:
     refresh_interval_minutes: int = 5
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ChatDefaults:
     """Default settings for chat conversations."""
     
@@ -97,7 +111,7 @@ class ChatDefaults:
     stream_responses: bool = True
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class EmbeddingsConfig:
     """Configuration for embeddings and RAG functionality."""
     
@@ -124,7 +138,7 @@ class EmbeddingsConfig:
     persist_directory: Optional[str] = None  # Will be set to data_directory/embeddings by default
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ApplicationConfig:
     """Main application configuration."""
     
@@ -164,37 +178,26 @@ class ApplicationConfig:
         if self.data_directory is None:
             self.data_directory = str(self.get_default_data_directory())
         
+        # Derived paths are stored as strings, so join them directly
+        data_directory = self.data_directory
+        
         if self.cache_directory is None:
-            self.cache_directory = str(Path(self.data_directory) / "cache")
+            self.cache_directory = os.path.join(data_directory, "cache")
         
         if self.logs_directory is None:
-            self.logs_directory = str(Path(self.data_directory) / "logs")
+            self.logs_directory = os.path.join(data_directory, "logs")
         
         if self.database_file is None:
-            self.database_file = str(Path(self.data_directory) / "llamalot.db")
+            self.database_file = os.path.join(data_directory, "llamalot.db")
         
         # Set embeddings persist directory if not specified
         if self.embeddings.persist_directory is None:
-            self.embeddings.persist_directory = str(Path(self.data_directory) / "embeddings")
+            self.embeddings.persist_directory = os.path.join(data_directory, "embeddings")
     
     @staticmethod
     def get_default_data_directory() -> Path:
         """Get the default data directory for the application."""
-        home = Path.home()
-        
-        # Platform-specific data directories
-        if os.name == 'nt':  # Windows
-            data_dir = home / "AppData" / "Local" / "LlamaLot"
-        elif os.name == 'posix':
-            if 'darwin' in os.uname().sysname.lower():  # macOS
-                data_dir = home / "Library" / "Application Support" / "LlamaLot"
-            else:  # Linux and other Unix-like
-                data_dir = home / ".llamalot"
-        else:
-            # Fallback
-            data_dir = home / ".llamalot"
-        
-        return data_dir
+        return Path.home().joinpath(*_DATA_DIRECTORY_PARTS)
     
     @staticmethod
     def get_config_file_path() -> Path:
@@ -230,9 +233,9 @@ class ApplicationConfig:
         # Convert to dictionary
         config_dict = self.to_dict()
         
-        # Write to file
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config_dict, f, indent=2, ensure_ascii=False)
+        # Write to a temporary file and swap it in, so a crash mid-write
+        # can't corrupt the existing configuration
+        atomic_write_text(config_path, json.dumps(config_dict, indent=2, ensure_ascii=False))
     
     @classmethod
     def load_from_file(cls, config_path: Optional[Path] = None) -> 'ApplicationConfig':
@@ -269,141 +272,61 @@ class ApplicationConfig:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert configuration to dictionary."""
-        return {
-            'ollama_server': {
-                'host': self.ollama_server.host,
-                'port': self.ollama_server.port,
-                'use_https': self.ollama_server.use_https,
-                'timeout': self.ollama_server.timeout,
-            },
-            'ui_preferences': {
-                'window_width': self.ui_preferences.window_width,
-                'window_height': self.ui_preferences.window_height,
-                'window_maximized': self.ui_preferences.window_maximized,
-                'model_list_sort_column': self.ui_preferences.model_list_sort_column,
-                'model_list_sort_ascending': self.ui_preferences.model_list_sort_ascending,
-                'show_model_details': self.ui_preferences.show_model_details,
-                'default_model': self.ui_preferences.default_model,
-                'auto_select_default_model': self.ui_preferences.auto_select_default_model,
-                'chat_font_size': self.ui_preferences.chat_font_size,
-                'chat_font_family': self.ui_preferences.chat_font_family,
-                'show_timestamps': self.ui_preferences.show_timestamps,
-                'auto_scroll_chat': self.ui_preferences.auto_scroll_chat,
-                'theme': self.ui_preferences.theme,
-                'confirm_model_deletion': self.ui_preferences.confirm_model_deletion,
-                'auto_refresh_models': self.ui_preferences.auto_refresh_models,
-                'refresh_interval_minutes': self.ui_preferences.refresh_interval_minutes,
-            },
-            'chat_defaults': {
-                'temperature': self.chat_defaults.temperature,
-                'top_p': self.chat_defaults.top_p,
-                'top_k': self.chat_defaults.top_k,
-                'repeat_penalty': self.chat_defaults.repeat_penalty,
-                'context_length': self.chat_defaults.context_length,
-                'keep_alive': self.chat_defaults.keep_alive,
-                'default_system_prompt': self.chat_defaults.default_system_prompt,
-                'stream_responses': self.chat_defaults.stream_responses,
-            },
-            'embeddings': {
-                'default_model': self.embeddings.default_model,
-                'rag_enabled': self.embeddings.rag_enabled,
-                'active_collections': self.embeddings.active_collections,
-                'chunk_size': self.embeddings.chunk_size,
-                'chunk_overlap': self.embeddings.chunk_overlap,
-                'search_results_limit': self.embeddings.search_results_limit,
-                'similarity_threshold': self.embeddings.similarity_threshold,
-                'auto_create_collections': self.embeddings.auto_create_collections,
-                'default_collection_name': self.embeddings.default_collection_name,
-                'persist_directory': self.embeddings.persist_directory,
-            },
-            'data_directory': self.data_directory,
-            'cache_directory': self.cache_directory,
-            'logs_directory': self.logs_directory,
-            'database_file': self.database_file,
-            'cache_expiry_hours': self.cache_expiry_hours,
-            'log_level': self.log_level,
-            'log_to_file': self.log_to_file,
-            'max_log_size_mb': self.max_log_size_mb,
-            'log_backup_count': self.log_backup_count,
-            'first_run': self.first_run,
-            'last_model_refresh': self.last_model_refresh,
-        }
+        result: Dict[str, Any] = {}
+        for name in _APPLICATION_FIELD_NAMES:
+            value = getattr(self, name)
+            section_field_names = _SECTION_FIELD_NAMES.get(name)
+            if section_field_names is not None:
+                value = {field_name: getattr(value, field_name) for field_name in section_field_names}
+            result[name] = value
+        return result
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ApplicationConfig':
         """Create configuration from dictionary."""
-        # Create server config
-        server_data = data.get('ollama_server', {})
-        ollama_server = OllamaServerConfig(
-            host=server_data.get('host', 'localhost'),
-            port=server_data.get('port', 11434),
-            use_https=server_data.get('use_https', False),
-            timeout=server_data.get('timeout', 180)
-        )
+        # Settings missing from the file take the data class field defaults
+        ollama_server = OllamaServerConfig(**_known_fields(_SECTION_FIELD_NAMES['ollama_server'], data.get('ollama_server', {})))
+        ui_preferences = UIPreferences(**_known_fields(_SECTION_FIELD_NAMES['ui_preferences'], data.get('ui_preferences', {})))
+        chat_defaults = ChatDefaults(**_known_fields(_SECTION_FIELD_NAMES['chat_defaults'], data.get('chat_defaults', {})))
         
-        # Create UI preferences
-        ui_data = data.get('ui_preferences', {})
-        ui_preferences = UIPreferences(
-            window_width=ui_data.get('window_width', 1200),
-            window_height=ui_data.get('window_height', 800),
-            window_maximized=ui_data.get('window_maximized', False),
-            model_list_sort_column=ui_data.get('model_list_sort_column', 'name'),
-            model_list_sort_ascending=ui_data.get('model_list_sort_ascending', True),
-            show_model_details=ui_data.get('show_model_details', True),
-            default_model=ui_data.get('default_model'),
-            auto_select_default_model=ui_data.get('auto_select_default_model', True),
-            chat_font_size=ui_data.get('chat_font_size', 12),
-            chat_font_family=ui_data.get('chat_font_family', 'Default'),
-            show_timestamps=ui_data.get('show_timestamps', True),
-            auto_scroll_chat=ui_data.get('auto_scroll_chat', True),
-            theme=ui_data.get('theme', 'default'),
-            confirm_model_deletion=ui_data.get('confirm_model_deletion', True),
-            auto_refresh_models=ui_data.get('auto_refresh_models', True),
-            refresh_interval_minutes=ui_data.get('refresh_interval_minutes', 5)
-        )
-        
-        # Create chat defaults
-        chat_data = data.get('chat_defaults', {})
-        chat_defaults = ChatDefaults(
-            temperature=chat_data.get('temperature', 0.8),
-            top_p=chat_data.get('top_p', 0.9),
-            top_k=chat_data.get('top_k', 40),
-            repeat_penalty=chat_data.get('repeat_penalty', 1.1),
-            context_length=chat_data.get('context_length', 2048),
-            keep_alive=chat_data.get('keep_alive', '5m'),
-            default_system_prompt=chat_data.get('default_system_prompt'),
-            stream_responses=chat_data.get('stream_responses', True)
-        )
-        
-        # Create embeddings config
-        embeddings_data = data.get('embeddings', {})
-        embeddings = EmbeddingsConfig(
-            default_model=embeddings_data.get('default_model', 'nomic-embed-text'),
-            rag_enabled=embeddings_data.get('rag_enabled', False),
-            active_collections=embeddings_data.get('active_collections', []),
-            chunk_size=embeddings_data.get('chunk_size', 2000),
-            chunk_overlap=embeddings_data.get('chunk_overlap', 200),
-            search_results_limit=embeddings_data.get('search_results_limit', 5),
-            similarity_threshold=embeddings_data.get('similarity_threshold', 0.7),
-            auto_create_collections=embeddings_data.get('auto_create_collections', True),
-            default_collection_name=embeddings_data.get('default_collection_name', 'documents'),
-            persist_directory=embeddings_data.get('persist_directory')
-        )
+        embeddings_values = _known_fields(_SECTION_FIELD_NAMES['embeddings'], data.get('embeddings', {}))
+        if 'active_collections' in embeddings_values:
+            embeddings_values['active_collections'] = list(embeddings_values['active_collections'])
+        embeddings = EmbeddingsConfig(**embeddings_values)
         
         return cls(
             ollama_server=ollama_server,
             ui_preferences=ui_preferences,
             chat_defaults=chat_defaults,
             embeddings=embeddings,
-            data_directory=data.get('data_directory'),
-            cache_directory=data.get('cache_directory'),
-            logs_directory=data.get('logs_directory'),
-            database_file=data.get('database_file'),
-            cache_expiry_hours=data.get('cache_expiry_hours', 24),
-            log_level=data.get('log_level', 'INFO'),
-            log_to_file=data.get('log_to_file', True),
-            max_log_size_mb=data.get('max_log_size_mb', 10),
-            log_backup_count=data.get('log_backup_count', 5),
-            first_run=data.get('first_run', True),
-            last_model_refresh=data.get('last_model_refresh')
+            **_known_fields(_APPLICATION_VALUE_FIELD_NAMES, data)
         )
+
+
+# Field names in declaration order, used by ApplicationConfig.to_dict
+_APPLICATION_FIELD_NAMES = tuple(f.name for f in fields(ApplicationConfig))
+_SECTION_FIELD_NAMES: Dict[str, Tuple[str, ...]] = {
+    'ollama_server': tuple(f.name for f in fields(OllamaServerConfig)),
+    'ui_preferences': tuple(f.name for f in fields(UIPreferences)),
+    'chat_defaults': tuple(f.name for f in fields(ChatDefaults)),
+    'embeddings': tuple(f.name for f in fields(EmbeddingsConfig)),
+}
+# Top-level fields holding plain values rather than a nested section
+_APPLICATION_VALUE_FIELD_NAMES = tuple(name for name in _APPLICATION_FIELD_NAMES if name not in _SECTION_FIELD_NAMES)
+
+
+def _known_fields(field_names: Tuple[str, ...], data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pick the stored values of a data class's fields.
+    
+    Keys that are not fields (e.g. settings written by a newer version) are
+    ignored so they cannot break data class construction.
+    
+    Args:
+        field_names: Field names of the data class being built
+        data: Stored values for the same section
+        
+    Returns:
+        New dictionary suitable for use as data class keyword arguments
+    """
+    return {key: data[key] for key in field_names if key in data}
@@ -6,14 +6,71 @@ Based on the Ollama API response formats from /api/tags and /api/show endpoints.
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List
 import json
 import logging
+import operator
+import sys
+
+from llamalot.utils.compat import DATACLASS_SLOTS
 
 logger = logging.getLogger(__name__)
 
+# Units used by OllamaModel.size_human_readable, in powers of 1024
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# Vision models typically have 'clip' (older models) or 'mllama' (newer models) in families
+_VISION_FAMILIES = frozenset({'clip', 'mllama'})
+
+# Fields serialized by OllamaModel.to_dict, in output order. The timestamps
+# and details are converted after the values are fetched in one call.
+_MODEL_DICT_FIELDS = (
+    'name', 'modified_at', 'size', 'digest', 'details',
+    'modelfile', 'parameters', 'template', 'system',
+    'last_updated', 'is_cached',
+)
+_DETAILS_DICT_FIELDS = (
+    'format', 'family', 'families', 'parameter_size',
+    'quantization_level', 'parent_model',
+)
+_get_model_dict_values = operator.attrgetter(*_MODEL_DICT_FIELDS)
+_get_details_dict_values = operator.attrgetter(*_DETAILS_DICT_FIELDS)
+
+# Sections of the /api/show model_info that ModelInfo maps to explicit fields
+_MAPPED_INFO_SECTIONS = frozenset({'general', 'llama', 'tokenizer'})
+
+
+if sys.version_info >= (3, 11):
+    # Python 3.11+ parses the 'Z' UTC suffix natively
+    _parse_iso_datetime = datetime.fromisoformat
+else:
+    def _parse_iso_datetime(value: str) -> datetime:
+        """Parse an ISO 8601 timestamp, accepting a trailing 'Z' for UTC."""
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return datetime.fromisoformat(value)
+
 
-@dataclass
+def _parse_modified_at(value: Any, default: datetime) -> datetime:
+    """
+    Convert an /api/tags modified_at value to a datetime.
+    
+    ollama-python hands over already parsed datetimes, which are returned as
+    is; raw JSON responses carry ISO 8601 strings such as
+    "2023-11-04T14:56:49.277302595-07:00". Missing, unparseable or otherwise
+    typed values fall back to default.
+    """
+    if isinstance(value, datetime):
+        return value
+    if not value or not isinstance(value, str):
+        return default
+    try:
+        return _parse_iso_datetime(value)
+    except ValueError:
+        return default
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ModelDetails:
     """Detailed information about a model's format and parameters."""
     
@@ -25,7 +82,7 @@ class ModelDetails:
     parent_model: str = ""
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ModelInfo:
     """Extended model information from the /api/show endpoint."""
     
@@ -83,13 +140,15 @@ class ModelInfo:
         info.tokenizer_model = tokenizer.get('model')
         
         # Store any additional data
-        info.extra_data = {k: v for k, v in model_info_dict.items() 
-                          if k not in ['general', 'llama', 'tokenizer']}
+        extra_data = model_info_dict.copy()
+        for key in _MAPPED_INFO_SECTIONS:
+            extra_data.pop(key, None)
+        info.extra_data = extra_data
         
         return info
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class OllamaModel:
     """
     Represents an Ollama model with all its metadata.
@@ -127,30 +186,32 @@ class OllamaModel:
             self.last_updated = datetime.now()
     
     @classmethod
-    def from_list_response(cls, model_data: Dict[str, Any]) -> 'OllamaModel':
+    def from_list_response(cls, model_data: Dict[str, Any], now: Optional[datetime] = None) -> 'OllamaModel':
         """
         Create an OllamaModel from the /api/tags response format.
         
         Args:
             model_data: Dictionary from the models list in /api/tags response
+            now: Timestamp to use for last_updated and as the modified_at
+                fallback; pass one shared value when parsing a whole list
             
         Returns:
             OllamaModel instance with basic information populated
         """
+        if now is None:
+            now = datetime.now()
+        
+        # Use 'model' field as the name since 'name' field is often empty
+        name_value = model_data.get('model', '') or model_data.get('name', '')
+        
+        # Entries without a usable name are expected and rejected without a traceback
+        if not isinstance(name_value, str) or not name_value.strip():
+            logger.warning(f"Skipping model with empty name. Model data: {model_data}")
+            raise ValueError(f"Model has empty or invalid name: {model_data}")
+        
         try:
             # Parse the modified_at timestamp
-            modified_at_value = model_data.get('modified_at', '')
-            if isinstance(modified_at_value, datetime):
-                # Already a datetime object
-                modified_at = modified_at_value
-            elif isinstance(modified_at_value, str) and modified_at_value:
-                try:
-                    # Handle ISO format: "2023-11-04T14:56:49.277302595-07:00"
-                    modified_at = datetime.fromisoformat(modified_at_value.replace('Z', '+00:00'))
-                except (ValueError, AttributeError):
-                    modified_at = datetime.now()
-            else:
-                modified_at = datetime.now()
+            modified_at = _parse_modified_at(model_data.get('modified_at'), now)
             
             # Create ModelDetails
             details_data = model_data.get('details', {})
@@ -163,28 +224,16 @@ class OllamaModel:
                 parent_model=details_data.get('parent_model', '')
             )
             
-            # Ensure size is an integer
-            size_value = model_data.get('size', 0)
-            if isinstance(size_value, str):
-                try:
-                    size_value = int(size_value)
-                except ValueError:
-                    size_value = 0
-            
-            # Use 'model' field as the name since 'name' field is often empty
-            name_value = model_data.get('model', '') or model_data.get('name', '')
-            
-            # Validate that we have a non-empty name
-            if not name_value or not name_value.strip():
-                logger.warning(f"Skipping model with empty name. Model data: {model_data}")
-                raise ValueError(f"Model has empty or invalid name: {model_data}")
+            # Ensure size is an integer (int() passes ints through and parses numeric strings)
+            try:
+                size_value = int(model_data.get('size', 0))
+            except (TypeError, ValueError):
+                size_value = 0
             
             # Detect capabilities based on model families
             capabilities = ['completion']  # All models can do text completion
             families = details_data.get('families', []) or []
-            # Vision models typically have 'clip' (older models) or 'mllama' (newer models) in families
-            vision_indicators = ['clip', 'mllama']
-            if families and any(indicator in families for indicator in vision_indicators):
+            if families and not _VISION_FAMILIES.isdisjoint(families):
                 capabilities.append('vision')
             
             return cls(
@@ -194,17 +243,42 @@ class OllamaModel:
                 digest=model_data.get('digest', ''),
                 details=details,
                 capabilities=capabilities,
+                last_updated=now,
                 is_cached=False
             )
             
-        except Exception as e:
-            # Enhanced error reporting
-            import traceback
-            print(f"Error parsing model data: {e}")
-            print(f"Model data: {model_data}")
-            print(f"Traceback: {traceback.format_exc()}")
+        except Exception:
+            # Unexpected failure: formatting (including the traceback) is deferred to the logging handlers
+            logger.exception("Error parsing model data: %s", model_data)
             raise
     
+    @classmethod
+    def from_tags_response(cls, models_data: Iterable[Dict[str, Any]]) -> List['OllamaModel']:
+        """
+        Create OllamaModels for every entry of an /api/tags models list.
+        
+        Entries rejected by from_list_response with ValueError, such as those
+        without a name, are skipped; from_list_response has already logged
+        them. All models share a single last_updated timestamp.
+        
+        Args:
+            models_data: The 'models' list from the /api/tags response
+            
+        Returns:
+            List of OllamaModel instances with basic information populated
+        """
+        models: List['OllamaModel'] = []
+        append = models.append
+        now = datetime.now()
+        
+        for model_data in models_data:
+            try:
+                append(cls.from_list_response(model_data, now))
+            except ValueError:
+                continue
+        
+        return models
+    
     def update_from_show_response(self, show_data: Dict[str, Any]) -> None:
         """
         Update the model with detailed information from /api/show response.
@@ -228,50 +302,33 @@ class OllamaModel:
     @property
     def size_human_readable(self) -> str:
         """Return human-readable size string."""
-        if self.size == 0:
+        size_bytes = int(self.size)
+        if size_bytes == 0:
             return "Unknown"
         
-        # Convert bytes to human readable format
-        size_bytes = float(self.size)
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} PB"
+        # Each unit is 2**10 times the previous one, so the unit index follows
+        # directly from the bit length without a division loop
+        unit_index = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (10 * unit_index)):.1f} {_SIZE_UNITS[unit_index]}"
     
     @property
     def short_name(self) -> str:
         """Return the model name without the tag if present."""
-        return self.name.split(':')[0]
+        return self.name.split(':', 1)[0]
     
     @property
     def tag(self) -> str:
         """Return the tag part of the model name, or 'latest' if none."""
-        parts = self.name.split(':')
+        parts = self.name.split(':', 1)
         return parts[1] if len(parts) > 1 else 'latest'
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the model to a dictionary for serialization."""
-        return {
-            'name': self.name,
-            'modified_at': self.modified_at.isoformat(),
-            'size': self.size,
-            'digest': self.digest,
-            'details': {
-                'format': self.details.format,
-                'family': self.details.family,
-                'families': self.details.families,
-                'parameter_size': self.details.parameter_size,
-                'quantization_level': self.details.quantization_level,
-                'parent_model': self.details.parent_model,
-            },
-            'modelfile': self.modelfile,
-            'parameters': self.parameters,
-            'template': self.template,
-            'system': self.system,
-            'last_updated': self.last_updated.isoformat() if self.last_updated else None,
-            'is_cached': self.is_cached,
-        }
+        data = dict(zip(_MODEL_DICT_FIELDS, _get_model_dict_values(self)))
+        data['modified_at'] = self.modified_at.isoformat()
+        data['details'] = dict(zip(_DETAILS_DICT_FIELDS, _get_details_dict_values(self.details)))
+        data['last_updated'] = self.last_updated.isoformat() if self.last_updated else None
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'OllamaModel':
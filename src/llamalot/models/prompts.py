@@ -4,13 +4,41 @@ Data models for the prompts system.
 Handles base prompts, extra prompts, and prompt configuration.
 """
 
+import bisect
+import hashlib
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Set, Tuple, Union
 import json
 import os
+import string
+import sys
 
+from llamalot.utils.compat import DATACLASS_SLOTS
+from llamalot.utils.file_utils import atomic_write_bytes
+from llamalot.utils.logging_config import get_logger
 
-@dataclass
+logger = get_logger(__name__)
+
+
+# Lowercases ASCII letters and turns spaces into underscores in a single pass
+_PROMPT_ID_TABLE = str.maketrans(string.ascii_uppercase + ' ', string.ascii_lowercase + '_')
+
+
+def _prompt_id_from_name(name: str) -> str:
+    """Derive a prompt id from its display name."""
+    if name.isascii():
+        return name.translate(_PROMPT_ID_TABLE)
+    # str.lower() also handles non-ASCII letters
+    return name.lower().replace(' ', '_')
+
+
+def _intern_str(value: Any) -> Any:
+    """Intern value if it is a string; anything else is returned unchanged."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(**DATACLASS_SLOTS)
 class BasePrompt:
     """Represents a base prompt."""
     name: str
@@ -21,10 +49,10 @@ class BasePrompt:
     
     def __post_init__(self):
         if not self.id:
-            self.id = self.name.lower().replace(' ', '_')
+            self.id = _prompt_id_from_name(self.name)
 
 
-@dataclass 
+@dataclass(**DATACLASS_SLOTS)
 class ExtraPrompt:
     """Represents an extra/additional prompt modifier."""
     name: str
@@ -36,7 +64,7 @@ class ExtraPrompt:
     
     def __post_init__(self):
         if not self.id:
-            self.id = self.name.lower().replace(' ', '_')
+            self.id = _prompt_id_from_name(self.name)
 
 
 @dataclass
@@ -47,58 +75,77 @@ class PromptsConfig:
     categories: List[str] = field(default_factory=list)
     length_options: List[str] = field(default_factory=list)
     
+    # Number of base and extra prompts using each category
+    _category_counts: Dict[str, int] = field(default_factory=Counter, init=False, repr=False, compare=False)
+    # Set mirror of the sorted categories list for O(1) membership tests
+    _category_set: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    # Prompt ids per category, kept as insertion-ordered dicts for O(1) removal
+    _base_ids_by_category: Dict[str, Dict[str, None]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _extra_ids_by_category: Dict[str, Dict[str, None]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # (file path, payload digest, st_mtime_ns, st_size) of the last file written by to_json_file
+    _last_saved: Optional[Tuple[str, bytes, int, int]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Build the category indexes from the initial prompts in one pass each."""
+        category_counts = self._category_counts = Counter()
+        
+        for prompts, index in ((self.base_prompts, self._base_ids_by_category),
+                               (self.extra_prompts, self._extra_ids_by_category)):
+            for prompt_id, prompt in prompts.items():
+                category = prompt.category
+                category_counts[category] += 1
+                _index_prompt(index, category, prompt_id)
+        
+        # Derive the categories from the prompts unless they were given explicitly;
+        # either way the list is kept sorted so later inserts can use bisect
+        self.categories = sorted(set(self.categories) if self.categories else category_counts)
+        self._category_set = set(self.categories)
+    
     @classmethod
     def from_json_file(cls, file_path: str) -> 'PromptsConfig':
         """Load prompts configuration from JSON file."""
-        if not os.path.exists(file_path):
-            return cls()
-            
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Read the whole file at once and decode straight from bytes
+            with open(file_path, 'rb') as f:
+                data = json.loads(f.read())
+            
+            # The category and type strings repeat across many prompts, so they are
+            # interned; the categories list itself is derived in __post_init__
+            intern = _intern_str
             
             # Parse base prompts
-            base_prompts = {}
-            if 'base' in data:
-                for prompt_id, prompt_data in data['base'].items():
-                    base_prompts[prompt_id] = BasePrompt(
-                        id=prompt_id,
-                        name=prompt_data.get('name', prompt_id),
-                        category=prompt_data.get('category', 'general'),
-                        input_type=prompt_data.get('input_type', 'text'),
-                        prompt=prompt_data.get('prompt', '')
-                    )
+            base_prompts = {
+                prompt_id: BasePrompt(
+                    id=prompt_id,
+                    name=prompt_data.get('name', prompt_id),
+                    category=intern(prompt_data.get('category', 'general')),
+                    input_type=intern(prompt_data.get('input_type', 'text')),
+                    prompt=prompt_data.get('prompt', '')
+                )
+                for prompt_id, prompt_data in data.get('base', {}).items()
+            }
             
             # Parse extra prompts
-            extra_prompts = {}
-            if 'extra' in data:
-                for prompt_id, prompt_data in data['extra'].items():
-                    extra_prompts[prompt_id] = ExtraPrompt(
-                        id=prompt_id,
-                        name=prompt_data.get('name', prompt_id),
-                        category=prompt_data.get('category', 'general'),
-                        type=prompt_data.get('type', 'boolean'),
-                        prompt=prompt_data.get('prompt', ''),
-                        default=prompt_data.get('default')
-                    )
-            
-            # Get categories from prompts
-            categories = set()
-            for prompt in base_prompts.values():
-                categories.add(prompt.category)
-            for prompt in extra_prompts.values():
-                categories.add(prompt.category)
-            
-            # Get length options
-            length_options = data.get('length', [])
+            extra_prompts = {
+                prompt_id: ExtraPrompt(
+                    id=prompt_id,
+                    name=prompt_data.get('name', prompt_id),
+                    category=intern(prompt_data.get('category', 'general')),
+                    type=intern(prompt_data.get('type', 'boolean')),
+                    prompt=prompt_data.get('prompt', ''),
+                    default=prompt_data.get('default')
+                )
+                for prompt_id, prompt_data in data.get('extra', {}).items()
+            }
             
             return cls(
                 base_prompts=base_prompts,
                 extra_prompts=extra_prompts,
-                categories=sorted(list(categories)),
-                length_options=length_options
+                length_options=data.get('length', [])
             )
             
+        except FileNotFoundError:
+            return cls()
         except Exception as e:
             logger.error(f"Failed to load prompts from {file_path}: {e}")
             return cls()
@@ -134,11 +181,25 @@ class PromptsConfig:
                     extra_data['default'] = prompt.default
                 data['extra'][prompt_id] = extra_data
             
-            # Write to file
+            # Serialize once and write the encoded payload in a single call
+            payload = json.dumps(data, indent=4, ensure_ascii=False).encode('utf-8')
+            
+            # Skip the write when this exact payload was already saved there and
+            # the file has not been modified since
+            digest = hashlib.blake2b(payload, digest_size=16).digest()
+            if self._last_saved is not None and self._last_saved[:2] == (file_path, digest):
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    stat = None
+                if stat is not None and self._last_saved[2:] == (stat.st_mtime_ns, stat.st_size):
+                    return True
+            
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            atomic_write_bytes(file_path, payload)
             
+            stat = os.stat(file_path)
+            self._last_saved = (file_path, digest, stat.st_mtime_ns, stat.st_size)
             return True
             
         except Exception as e:
@@ -151,9 +212,8 @@ class PromptsConfig:
             return False
         
         self.base_prompts[prompt.id] = prompt
-        if prompt.category not in self.categories:
-            self.categories.append(prompt.category)
-            self.categories.sort()
+        _index_prompt(self._base_ids_by_category, prompt.category, prompt.id)
+        self._add_category_use(prompt.category)
         return True
     
     def update_base_prompt(self, prompt: BasePrompt) -> bool:
@@ -164,16 +224,13 @@ class PromptsConfig:
         old_category = self.base_prompts[prompt.id].category
         self.base_prompts[prompt.id] = prompt
         
-        # Update categories if needed
-        if prompt.category not in self.categories:
-            self.categories.append(prompt.category)
-            self.categories.sort()
+        if old_category != prompt.category:
+            _unindex_prompt(self._base_ids_by_category, old_category, prompt.id)
+            _index_prompt(self._base_ids_by_category, prompt.category, prompt.id)
         
-        # Remove old category if no longer used
-        if old_category != prompt.category and old_category in self.categories:
-            if not any(p.category == old_category for p in self.base_prompts.values()):
-                if not any(p.category == old_category for p in self.extra_prompts.values()):
-                    self.categories.remove(old_category)
+        # Move the prompt's category usage, dropping the old category if no longer used
+        self._add_category_use(prompt.category)
+        self._remove_category_use(old_category)
         
         return True
     
@@ -184,12 +241,10 @@ class PromptsConfig:
         
         old_category = self.base_prompts[prompt_id].category
         del self.base_prompts[prompt_id]
+        _unindex_prompt(self._base_ids_by_category, old_category, prompt_id)
         
         # Remove category if no longer used
-        if old_category in self.categories:
-            if not any(p.category == old_category for p in self.base_prompts.values()):
-                if not any(p.category == old_category for p in self.extra_prompts.values()):
-                    self.categories.remove(old_category)
+        self._remove_category_use(old_category)
         
         return True
     
@@ -199,9 +254,8 @@ class PromptsConfig:
             return False
         
         self.extra_prompts[prompt.id] = prompt
-        if prompt.category not in self.categories:
-            self.categories.append(prompt.category)
-            self.categories.sort()
+        _index_prompt(self._extra_ids_by_category, prompt.category, prompt.id)
+        self._add_category_use(prompt.category)
         return True
     
     def update_extra_prompt(self, prompt: ExtraPrompt) -> bool:
@@ -212,16 +266,13 @@ class PromptsConfig:
         old_category = self.extra_prompts[prompt.id].category
         self.extra_prompts[prompt.id] = prompt
         
-        # Update categories if needed
-        if prompt.category not in self.categories:
-            self.categories.append(prompt.category)
-            self.categories.sort()
+        if old_category != prompt.category:
+            _unindex_prompt(self._extra_ids_by_category, old_category, prompt.id)
+            _index_prompt(self._extra_ids_by_category, prompt.category, prompt.id)
         
-        # Remove old category if no longer used
-        if old_category != prompt.category and old_category in self.categories:
-            if not any(p.category == old_category for p in self.base_prompts.values()):
-                if not any(p.category == old_category for p in self.extra_prompts.values()):
-                    self.categories.remove(old_category)
+        # Move the prompt's category usage, dropping the old category if no longer used
+        self._add_category_use(prompt.category)
+        self._remove_category_use(old_category)
         
         return True
     
@@ -232,24 +283,50 @@ class PromptsConfig:
         
         old_category = self.extra_prompts[prompt_id].category
         del self.extra_prompts[prompt_id]
+        _unindex_prompt(self._extra_ids_by_category, old_category, prompt_id)
         
         # Remove category if no longer used
-        if old_category in self.categories:
-            if not any(p.category == old_category for p in self.base_prompts.values()):
-                if not any(p.category == old_category for p in self.extra_prompts.values()):
-                    self.categories.remove(old_category)
+        self._remove_category_use(old_category)
         
         return True
     
+    def _add_category_use(self, category: str) -> None:
+        """Count one more prompt in a category, registering the category if new."""
+        self._category_counts[category] += 1
+        if category not in self._category_set:
+            self._category_set.add(category)
+            bisect.insort(self.categories, category)
+    
+    def _remove_category_use(self, category: str) -> None:
+        """Count one less prompt in a category, dropping the category once unused."""
+        self._category_counts[category] -= 1
+        if self._category_counts[category] <= 0:
+            del self._category_counts[category]
+            if category in self._category_set:
+                self._category_set.discard(category)
+                self.categories.remove(category)
+    
     def get_base_prompts_by_category(self, category: str) -> List[BasePrompt]:
         """Get all base prompts in a specific category."""
-        return [p for p in self.base_prompts.values() if p.category == category]
+        base_prompts = self.base_prompts
+        return [base_prompts[prompt_id] for prompt_id in self._base_ids_by_category.get(category, ())]
     
     def get_extra_prompts_by_category(self, category: str) -> List[ExtraPrompt]:
         """Get all extra prompts in a specific category."""
-        return [p for p in self.extra_prompts.values() if p.category == category]
+        extra_prompts = self.extra_prompts
+        return [extra_prompts[prompt_id] for prompt_id in self._extra_ids_by_category.get(category, ())]
 
 
-# Import logger after defining the models to avoid circular imports
-from llamalot.utils.logging_config import get_logger
-logger = get_logger(__name__)
+def _index_prompt(index: Dict[str, Dict[str, None]], category: str, prompt_id: str) -> None:
+    """Add a prompt id to a category -> ids index."""
+    index.setdefault(category, {})[prompt_id] = None
+
+
+def _unindex_prompt(index: Dict[str, Dict[str, None]], category: str, prompt_id: str) -> None:
+    """Remove a prompt id from a category -> ids index, dropping empty categories."""
+    prompt_ids = index.get(category)
+    if prompt_ids is not None:
+        prompt_ids.pop(prompt_id, None)
+        if not prompt_ids:
+            del index[category]
+
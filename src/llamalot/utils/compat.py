@@ -0,0 +1,15 @@
+"""
+Python version compatibility helpers for LlamaLot application.
+
+Keeps interpreter-specific feature checks in one place so the rest of the
+code base can stay version agnostic.
+"""
+
+import sys
+from typing import Any, Dict
+
+
+# Keyword arguments for @dataclass that enable __slots__ where supported.
+# dataclass(slots=True) was added in Python 3.10; older interpreters fall
+# back to regular __dict__-backed instances.
+DATACLASS_SLOTS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
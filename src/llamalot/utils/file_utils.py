@@ -0,0 +1,54 @@
+"""
+File operation helpers for LlamaLot application.
+
+Provides safe file writing used when persisting configuration and prompt data.
+"""
+
+import os
+from pathlib import Path
+from typing import AnyStr, Optional, Union
+
+
+def atomic_write_text(path: Union[str, Path], text: str, encoding: str = 'utf-8') -> None:
+    """
+    Write text to a file atomically.
+
+    The content is written to a temporary file next to the target in a single
+    write call and then moved over the target with os.replace, so a crash
+    mid-write never leaves a truncated file behind.
+
+    Args:
+        path: Destination file path
+        text: Text content to write
+        encoding: Text encoding to use (default: utf-8)
+    """
+    _atomic_write(path, text, 'w', encoding)
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes) -> None:
+    """
+    Write already encoded bytes to a file atomically.
+
+    Args:
+        path: Destination file path
+        data: Bytes to write
+    """
+    _atomic_write(path, data, 'wb', None)
+
+
+def _atomic_write(path: Union[str, Path], content: AnyStr, mode: str, encoding: Optional[str]) -> None:
+    """Write content to a temporary sibling file and move it over path."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+
+    try:
+        with open(tmp_path, mode, encoding=encoding) as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a stale temporary file behind
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -4,29 +4,114 @@ Logging configuration for LlamaLot application.
 Sets up consistent logging across the entire application.
 """
 
+import atexit
+import functools
 import logging
 import logging.handlers
 import os
+import queue
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+
+# Background listener that writes queued log records to the real handlers
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_listener() -> None:
+    """Flush queued records and close the handlers of the active listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+class _BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that coalesces writes in a large stream buffer.
+    
+    The stock handler flushes after every record, costing one write syscall
+    per log line. Here only warnings and errors are flushed immediately;
+    everything else reaches the disk when the buffer fills, on rollover or
+    when the handler is closed at exit.
+    
+    The stock rollover check seeks to the end of the stream for every
+    record, which flushes the buffer. Instead the file size is tracked as
+    records are written, counted in characters like the stock check.
+    """
+    
+    buffer_size = 64 * 1024
+    
+    # Size of the open log file, and of the record about to be written
+    _stream_size = 0
+    _pending_size = 0
+    
+    # Set while emitting a record that should stay in the buffer
+    _defer_flush = False
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                      encoding=self.encoding, errors=getattr(self, 'errors', None))
+        self._stream_size = os.fstat(stream.fileno()).st_size
+        return stream
+    
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes <= 0:
+            return False
+        self._pending_size = len(self.format(record)) + len(self.terminator)
+        return self._stream_size + self._pending_size >= self.maxBytes
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        self._defer_flush = record.levelno < logging.WARNING
+        try:
+            super().emit(record)
+            self._stream_size += self._pending_size
+        finally:
+            self._defer_flush = False
+            self._pending_size = 0
+    
+    def flush(self) -> None:
+        # StreamHandler.emit flushes after every record; skip it for records
+        # below WARNING so they stay in the buffer
+        if not self._defer_flush:
+            super().flush()
 
 
 def setup_logging(
     level: int = logging.INFO,
     log_file: Optional[str] = None,
     max_bytes: int = 10 * 1024 * 1024,  # 10MB
-    backup_count: int = 5
+    backup_count: int = 5,
+    *,
+    force: bool = False
 ) -> None:
     """
     Set up logging configuration for the application.
     
+    Console and file output are handled on a background QueueListener thread;
+    the root logger only enqueues records, so logging never blocks on I/O.
+    
     Args:
         level: Logging level (default: INFO)
         log_file: Path to log file (default: ~/llamalot.log)
         max_bytes: Maximum size of log file before rotation
         backup_count: Number of backup log files to keep
+        force: Reconfigure even if logging has already been set up
     """
+    global _listener
+    
+    # Repeated calls keep the existing handlers unless explicitly forced
+    if _listener is not None and not force:
+        return
+    
     # Create logs directory in user's home if not specified
     if log_file is None:
         log_dir = Path.home() / ".llamalot" / "logs"
@@ -46,16 +131,18 @@ def setup_logging(
     # Remove any existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_listener()
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers: List[logging.Handler] = [console_handler]
     
     # File handler with rotation
+    file_error: Optional[Exception] = None
     try:
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = _BufferedRotatingFileHandler(
             log_file,
             maxBytes=max_bytes,
             backupCount=backup_count,
@@ -63,18 +150,29 @@ def setup_logging(
         )
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
-        
-        logging.info(f"Logging to file: {log_file}")
-        
+        handlers.append(file_handler)
     except (OSError, PermissionError) as e:
-        logging.warning(f"Could not set up file logging: {e}")
+        file_error = e
+    
+    # Route all records through a queue drained by the listener thread
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    
+    if file_error is None:
+        logging.info(f"Logging to file: {log_file}")
+    else:
+        logging.warning(f"Could not set up file logging: {file_error}")
 
 
+@functools.lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a specific module.
     
+    Results are memoized so repeated lookups skip the logging module lock.
+    
     Args:
         name: Name of the logger (usually __name__)
         
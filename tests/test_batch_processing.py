@@ -15,44 +15,54 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from llamalot.models.chat import ChatImage
 
+DESCRIPTION_WILDCARD = '%description%'
+
 
 class TestBatchProcessingLogic(unittest.TestCase):
     """Test cases for batch processing logic (without GUI dependencies)."""
     
+    EXISTING_CONTENT = "This is a beautiful landscape with mountains and trees."
+    
+    # (prompt, expected) pairs for substitution against EXISTING_CONTENT
+    SUBSTITUTION_CASES = [
+        ("Describe this image: %description%",
+         f"Describe this image: {EXISTING_CONTENT}"),
+        ("Based on: %description% - now add more details about colors.",
+         f"Based on: {EXISTING_CONTENT} - now add more details about colors."),
+        ("Multiple wildcards: %description% and %description% again",
+         f"Multiple wildcards: {EXISTING_CONTENT} and {EXISTING_CONTENT} again"),
+        ("No wildcards in this prompt",
+         "No wildcards in this prompt"),
+    ]
+    
     def get_output_filename(self, image_path: str) -> str:
         """Get the output text filename for an image (mimics the method in BatchProcessingPanel)."""
-        path = Path(image_path)
-        return str(path.with_suffix('.txt'))
+        return os.path.splitext(image_path)[0] + '.txt'
 
     def process_prompt_wildcards(self, prompt: str, image_path: str) -> str:
         """
         Process wildcards in the prompt, substituting them with content from existing files.
         This mimics the _process_prompt_wildcards method from BatchProcessingPanel.
         """
-        processed_prompt = prompt
+        if DESCRIPTION_WILDCARD not in prompt:
+            return prompt
         
-        # Handle %description% wildcard
-        if '%description%' in processed_prompt:
+        try:
+            # Get the path to the text file for this image
+            text_file_path = self.get_output_filename(image_path)
+            
             try:
-                # Get the path to the text file for this image
-                text_file_path = self.get_output_filename(image_path)
-                
-                if os.path.exists(text_file_path):
-                    # Read existing content
-                    with open(text_file_path, 'r', encoding='utf-8') as f:
-                        existing_content = f.read().strip()
-                else:
-                    # File doesn't exist, substitute with empty string
-                    existing_content = ""
-                
-                # Replace the wildcard
-                processed_prompt = processed_prompt.replace('%description%', existing_content)
-                
-            except Exception:
-                # On error, just replace with empty string
-                processed_prompt = processed_prompt.replace('%description%', "")
+                # Read existing content
+                existing_content = Path(text_file_path).read_text(encoding='utf-8').strip()
+            except FileNotFoundError:
+                # File doesn't exist, substitute with empty string
+                existing_content = ""
+            
+        except Exception:
+            # On error, just replace with empty string
+            existing_content = ""
         
-        return processed_prompt
+        return prompt.replace(DESCRIPTION_WILDCARD, existing_content)
     
     def test_get_output_filename(self):
         """Test output filename generation."""
@@ -75,33 +85,12 @@ class TestBatchProcessingLogic(unittest.TestCase):
             text_path = Path(temp_dir) / "test_image.txt"
             
             # Create the text file with existing content
-            existing_content = "This is a beautiful landscape with mountains and trees."
-            with open(text_path, 'w', encoding='utf-8') as f:
-                f.write(existing_content)
-            
-            test_cases = [
-                {
-                    "prompt": "Describe this image: %description%",
-                    "expected": f"Describe this image: {existing_content}",
-                },
-                {
-                    "prompt": "Based on: %description% - now add more details about colors.",
-                    "expected": f"Based on: {existing_content} - now add more details about colors.",
-                },
-                {
-                    "prompt": "Multiple wildcards: %description% and %description% again",
-                    "expected": f"Multiple wildcards: {existing_content} and {existing_content} again",
-                },
-                {
-                    "prompt": "No wildcards in this prompt",
-                    "expected": "No wildcards in this prompt",
-                }
-            ]
+            text_path.write_bytes(self.EXISTING_CONTENT.encode('utf-8'))
             
-            for test_case in test_cases:
-                with self.subTest(prompt=test_case["prompt"]):
-                    result = self.process_prompt_wildcards(test_case["prompt"], str(image_path))
-                    self.assertEqual(result, test_case["expected"])
+            for prompt, expected in self.SUBSTITUTION_CASES:
+                with self.subTest(prompt=prompt):
+                    result = self.process_prompt_wildcards(prompt, str(image_path))
+                    self.assertEqual(result, expected)
     
     def test_wildcard_substitution_with_missing_file(self):
         """Test %description% wildcard substitution with missing file."""
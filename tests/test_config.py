@@ -6,7 +6,7 @@ import json
 import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 from llamalot.backend.config import ConfigurationManager, get_config_manager, get_config
 from llamalot.models import ApplicationConfig
@@ -15,17 +15,24 @@ from llamalot.models import ApplicationConfig
 class TestConfigurationManager(unittest.TestCase):
     """Test cases for ConfigurationManager."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary directory shared by all tests in the class."""
+        cls._temp_dir = tempfile.TemporaryDirectory()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared temporary directory."""
+        cls._temp_dir.cleanup()
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        # Each test gets its own subdirectory of the shared temporary directory
+        self.temp_dir = str(Path(self._temp_dir.name) / self._testMethodName)
+        Path(self.temp_dir).mkdir()
         self.config_path = Path(self.temp_dir) / "test_config.json"
         self.manager = ConfigurationManager(self.config_path)
     
-    def tearDown(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_initialization(self):
         """Test configuration manager initialization."""
         self.assertEqual(self.manager.config_path, self.config_path)
@@ -78,6 +85,17 @@ class TestConfigurationManager(unittest.TestCase):
         loaded_config = new_manager.load()
         self.assertEqual(loaded_config.ollama_server.host, "saved.example.com")
     
+    def test_save_config_is_atomic(self):
+        """Test that saving replaces the file without leaving a temporary file."""
+        self.config_path.write_text("stale", encoding='utf-8')
+        self.manager.config.ollama_server.host = "atomic.example.com"
+        
+        self.assertTrue(self.manager.save())
+        
+        self.assertEqual(json.loads(self.config_path.read_text(encoding='utf-8'))['ollama_server']['host'],
+                         "atomic.example.com")
+        self.assertEqual([p.name for p in Path(self.temp_dir).iterdir()], [self.config_path.name])
+    
     def test_save_without_loaded_config(self):
         """Test saving when no configuration is loaded."""
         result = self.manager.save()
@@ -273,8 +291,14 @@ class TestConfigurationManager(unittest.TestCase):
         self.assertIn("loaded=False", str_repr)
 
 
+@patch('llamalot.backend.config._config_manager', None)
 class TestGlobalConfigManager(unittest.TestCase):
-    """Test cases for global configuration manager functions."""
+    """
+    Test cases for global configuration manager functions.
+    
+    Every test runs with the module-level singleton patched to None, so no
+    test depends on or leaks global state and the class can run in parallel.
+    """
     
     def test_get_config_manager_singleton(self):
         """Test that get_config_manager returns singleton instance."""
@@ -290,16 +314,15 @@ class TestGlobalConfigManager(unittest.TestCase):
         
         self.assertIsInstance(config, ApplicationConfig)
     
-    @patch('llamalot.backend.config._config_manager', None)
     def test_get_config_manager_fresh_instance(self):
         """Test getting fresh configuration manager instance."""
-        # Reset global instance
         import llamalot.backend.config
-        llamalot.backend.config._config_manager = None
+        self.assertIsNone(llamalot.backend.config._config_manager)
         
         manager = get_config_manager()
         
         self.assertIsInstance(manager, ConfigurationManager)
+        self.assertIs(llamalot.backend.config._config_manager, manager)
 
 
 if __name__ == '__main__':
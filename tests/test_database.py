@@ -2,33 +2,134 @@
 Tests for database management functionality.
 """
 
+import shutil
 import sqlite3
 import tempfile
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from unittest.mock import patch, MagicMock
 
 from llamalot.backend.database import DatabaseManager, DatabaseError, MigrationError
-from llamalot.models import OllamaModel, ChatMessage, ChatConversation
+from llamalot.models import OllamaModel, ChatMessage, ChatConversation, ChatImage
 from llamalot.models.ollama_model import ModelDetails, ModelInfo
 from llamalot.models.chat import MessageRole
 
 
+# Fixed timestamp for fixtures, so tests don't depend on the wall clock
+FIXED_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+# Keyword arguments for the models used across tests, keyed by model name
+MODEL_FIXTURES = {
+    "test-model:7b": dict(
+        size=1000000000,
+        digest="abc123",
+        details=dict(
+            format="gguf",
+            family="llama",
+            families=["llama"],
+            parameter_size="7B",
+            quantization_level="Q4_0"
+        )
+    ),
+    "test-model-with-info:7b": dict(
+        size=1000000000,
+        digest="def456",
+        details=dict(family="llama"),
+        model_info=dict(
+            architecture="llama",
+            parameter_count=7000000000,
+            context_length=4096,
+            vocab_size=32000
+        )
+    ),
+    "test-model": dict(size=1000, digest="test123"),
+    "old-model": dict(size=1000, digest="old123"),
+    "stats-model": dict(size=1000, digest="stats123"),
+}
+
+
+def make_model(name: str) -> OllamaModel:
+    """Build a fresh OllamaModel from MODEL_FIXTURES."""
+    fixture = MODEL_FIXTURES[name]
+    kwargs = dict(name=name, size=fixture["size"], digest=fixture["digest"], modified_at=FIXED_NOW)
+    if "details" in fixture:
+        kwargs["details"] = ModelDetails(**fixture["details"])
+    if "model_info" in fixture:
+        kwargs["model_info"] = ModelInfo(**fixture["model_info"])
+    return OllamaModel(**kwargs)
+
+
 class TestDatabaseManager(unittest.TestCase):
     """Test cases for DatabaseManager."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create the database schema once into a template file."""
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls.template_path = Path(cls._temp_dir.name) / "template.db"
+        DatabaseManager(cls.template_path).close()
+        
+        # A second template with the rows used by the cleanup and stats tests
+        cls.seeded_path = Path(cls._temp_dir.name) / "seeded.db"
+        shutil.copyfile(cls.template_path, cls.seeded_path)
+        with DatabaseManager(cls.seeded_path) as db:
+            cls._seed(db)
+    
+    @staticmethod
+    def _seed(db):
+        """Insert the shared fixture rows into db."""
+        db.save_model(make_model("old-model"))
+        db.save_conversation(ChatConversation(
+            conversation_id="old-conv",
+            title="Old Conversation",
+            model_name="old-model"  # Reference the model we created
+        ))
+        
+        # Manually age both records in a single transaction
+        old_timestamp = (datetime.now() - timedelta(days=31)).isoformat()
+        with db.transaction() as conn:
+            conn.execute(
+                "UPDATE models SET last_accessed = ? WHERE name = ?",
+                (old_timestamp, "old-model")
+            )
+            conn.execute(
+                "UPDATE conversations SET updated_at = ? WHERE conversation_id = ?",
+                (old_timestamp, "old-conv")
+            )
+        
+        db.save_model(make_model("stats-model"))
+        conversation = ChatConversation(
+            conversation_id="stats-conv",
+            title="Stats Conversation"
+        )
+        conversation.add_message(ChatMessage(role=MessageRole.USER, content="Test"))
+        db.save_conversation(conversation)
+        db.set_app_state("stats_test", "value")
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the template and all per-test databases."""
+        cls._temp_dir.cleanup()
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        # Start each test from a copy of the template; the schema is already current
+        self.temp_dir = tempfile.mkdtemp(dir=self._temp_dir.name)
         self.db_path = Path(self.temp_dir) / "test.db"
+        shutil.copyfile(self.template_path, self.db_path)
         self.db = DatabaseManager(self.db_path)
     
     def tearDown(self):
         """Clean up test fixtures."""
         self.db.close()
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _use_seeded_db(self):
+        """Reopen self.db on a copy of the seeded template."""
+        self.db.close()
+        shutil.copyfile(self.seeded_path, self.db_path)
+        self.db = DatabaseManager(self.db_path)
     
     def test_initialization(self):
         """Test database manager initialization."""
@@ -36,50 +137,24 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertEqual(self.db.db_path, self.db_path)
         self.assertEqual(self.db.SCHEMA_VERSION, 1)
     
-    def test_schema_creation(self):
-        """Test that database schema is created correctly."""
-        conn = self.db._get_connection()
-        
-        # Check that all tables exist
-        cursor = conn.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name NOT LIKE 'sqlite_%'
-            ORDER BY name
-        """)
-        tables = [row[0] for row in cursor.fetchall()]
-        
-        expected_tables = [
-            'app_state', 'conversations', 'db_metadata',
-            'message_attachments', 'messages', 'models'
-        ]
-        self.assertEqual(sorted(tables), sorted(expected_tables))
-    
-    def test_schema_version(self):
-        """Test schema version management."""
-        # Initial version should be set to current schema version
-        version = self.db._get_schema_version()
-        self.assertEqual(version, self.db.SCHEMA_VERSION)
-        
-        # Test setting version
-        self.db._set_schema_version(2)
-        version = self.db._get_schema_version()
-        self.assertEqual(version, 2)
-    
     def test_transaction_context_manager(self):
         """Test transaction context manager."""
+        # The transaction hands out this thread's pooled connection, so one handle serves the test
+        conn = self.db._get_connection()
+        
         # Test successful transaction
-        with self.db.transaction() as conn:
+        with self.db.transaction() as tx_conn:
+            self.assertIs(tx_conn, conn)
             conn.execute("INSERT INTO app_state (key, value) VALUES ('test', 'value')")
         
         # Verify data was committed
-        conn = self.db._get_connection()
         cursor = conn.execute("SELECT value FROM app_state WHERE key = 'test'")
         row = cursor.fetchone()
         self.assertEqual(row['value'], 'value')
         
         # Test failed transaction (should rollback)
         try:
-            with self.db.transaction() as conn:
+            with self.db.transaction():
                 conn.execute("INSERT INTO app_state (key, value) VALUES ('test2', 'value2')")
                 raise ValueError("Test error")
         except ValueError:
@@ -93,19 +168,7 @@ class TestDatabaseManager(unittest.TestCase):
     def test_model_operations(self):
         """Test model save, get, list, and delete operations."""
         # Create test model
-        model = OllamaModel(
-            name="test-model:7b",
-            size=1000000000,
-            digest="abc123",
-            modified_at=datetime.now(),
-            details=ModelDetails(
-                format="gguf",
-                family="llama",
-                families=["llama"],
-                parameter_size="7B",
-                quantization_level="Q4_0"
-            )
-        )
+        model = make_model("test-model:7b")
         
         # Test save
         self.db.save_model(model)
@@ -145,42 +208,10 @@ class TestDatabaseManager(unittest.TestCase):
         deleted_again = self.db.delete_model("test-model:7b")
         self.assertFalse(deleted_again)
     
-    def test_model_with_info(self):
-        """Test model operations with ModelInfo."""
-        model = OllamaModel(
-            name="test-model-with-info:7b",
-            size=1000000000,
-            digest="def456",
-            modified_at=datetime.now(),
-            details=ModelDetails(family="llama"),
-            model_info=ModelInfo(
-                architecture="llama",
-                parameter_count=7000000000,
-                context_length=4096,
-                vocab_size=32000
-            )
-        )
-        
-        # Save and retrieve
-        self.db.save_model(model)
-        retrieved = self.db.get_model("test-model-with-info:7b")
-        
-        self.assertIsNotNone(retrieved)
-        self.assertIsNotNone(retrieved.model_info)
-        self.assertEqual(retrieved.model_info.architecture, "llama")
-        self.assertEqual(retrieved.model_info.parameter_count, 7000000000)
-        self.assertEqual(retrieved.model_info.context_length, 4096)
-        self.assertEqual(retrieved.model_info.vocab_size, 32000)
-    
     def test_conversation_operations(self):
         """Test conversation save, get, list, and delete operations."""
         # First create a test model that the conversation can reference
-        test_model = OllamaModel(
-            name="test-model:7b",
-            size=1000000000,
-            digest="abc123",
-            modified_at=datetime.now()
-        )
+        test_model = make_model("test-model:7b")
         self.db.save_model(test_model)
         
         # Create test conversation
@@ -245,12 +276,7 @@ class TestDatabaseManager(unittest.TestCase):
     def test_message_with_images(self):
         """Test saving and retrieving messages with image attachments."""
         # Create model first
-        model = OllamaModel(
-            name="test-model",
-            size=1000,
-            digest="test123",
-            modified_at=datetime.now()
-        )
+        model = make_model("test-model")
         self.db.save_model(model)
         
         # Create conversation that references the model
@@ -259,15 +285,32 @@ class TestDatabaseManager(unittest.TestCase):
             title="Test Conversation",
             model_name="test-model"  # Reference the model we created
         )
+        images = [
+            ChatImage(data="aW1hZ2Ux", filename=f"image{i}.png", mime_type="image/png", size=6)
+            for i in range(3)
+        ]
+        conv.add_message(ChatMessage(role=MessageRole.USER, content="Look at these", images=images))
+        conv.add_message(ChatMessage(role=MessageRole.ASSISTANT, content="Nice images"))
+        self.db.save_conversation(conv)
+        
+        retrieved = self.db.get_conversation("test-conv")
+        self.assertEqual(
+            [image.filename for image in retrieved.messages[0].images],
+            ["image0.png", "image1.png", "image2.png"]
+        )
+        self.assertEqual(retrieved.messages[0].images[0].data, "aW1hZ2Ux")
+        self.assertEqual(retrieved.messages[1].images, [])
     
     def test_app_state_operations(self):
         """Test application state operations."""
-        # Test setting different types
-        self.db.set_app_state("string_key", "string_value")
-        self.db.set_app_state("int_key", 42)
-        self.db.set_app_state("float_key", 3.14)
-        self.db.set_app_state("bool_key", True)
-        self.db.set_app_state("json_key", {"nested": "dict", "list": [1, 2, 3]})
+        # Test setting different types in one transaction
+        self.db.set_app_state_many({
+            "string_key": "string_value",
+            "int_key": 42,
+            "float_key": 3.14,
+            "bool_key": True,
+            "json_key": {"nested": "dict", "list": [1, 2, 3]},
+        })
         
         # Test getting values
         self.assertEqual(self.db.get_app_state("string_key"), "string_value")
@@ -293,36 +336,8 @@ class TestDatabaseManager(unittest.TestCase):
     
     def test_cleanup_old_data(self):
         """Test cleanup of old data."""
-        # Create old model first
-        old_model = OllamaModel(
-            name="old-model",
-            size=1000,
-            digest="old123",
-            modified_at=datetime.now()
-        )
-        self.db.save_model(old_model)
-        
-        # Manually update last_accessed to be old
-        conn = self.db._get_connection()
-        old_timestamp = (datetime.now() - timedelta(days=31)).isoformat()
-        conn.execute(
-            "UPDATE models SET last_accessed = ? WHERE name = ?",
-            (old_timestamp, "old-model")
-        )
-        
-        # Create old conversation that references the model
-        old_conv = ChatConversation(
-            conversation_id="old-conv",
-            title="Old Conversation",
-            model_name="old-model"  # Reference the model we created
-        )
-        self.db.save_conversation(old_conv)
-        
-        # Manually update timestamp to be old
-        conn.execute(
-            "UPDATE conversations SET updated_at = ? WHERE conversation_id = ?",
-            (old_timestamp, "old-conv")
-        )
+        # The seeded database holds a model and conversation aged past 30 days
+        self._use_seeded_db()
         
         # Run cleanup
         stats = self.db.cleanup_old_data(days=30)
@@ -337,23 +352,8 @@ class TestDatabaseManager(unittest.TestCase):
     
     def test_database_stats(self):
         """Test database statistics."""
-        # Add some data
-        model = OllamaModel(
-            name="stats-model",
-            size=1000,
-            digest="stats123",
-            modified_at=datetime.now()
-        )
-        self.db.save_model(model)
-        
-        conversation = ChatConversation(
-            conversation_id="stats-conv",
-            title="Stats Conversation"
-        )
-        conversation.add_message(ChatMessage(role=MessageRole.USER, content="Test"))
-        self.db.save_conversation(conversation)
-        
-        self.db.set_app_state("stats_test", "value")
+        # The seeded database holds a model, a conversation with a message and app state
+        self._use_seeded_db()
         
         # Get stats
         stats = self.db.get_database_stats()
@@ -388,48 +388,165 @@ class TestDatabaseManager(unittest.TestCase):
     
     def test_thread_safety(self):
         """Test thread-local connections."""
-        import threading
-        
-        results = {}
-        
-        def worker(thread_id):
+        def worker(task_id):
             # Each thread should get its own connection
             conn1 = self.db._get_connection()
             conn2 = self.db._get_connection()
             
             # Same thread should get same connection
-            results[thread_id] = (conn1 is conn2, id(conn1))
+            return threading.current_thread(), conn1 is conn2, conn1
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(worker, range(32)))
         
-        threads = []
+        # Each thread should have gotten the same connection for multiple calls
+        for thread, same_conn, conn in results:
+            self.assertTrue(same_conn, f"{thread.name} got different connections")
+        
+        # Pooled threads reuse their connection across tasks, and different
+        # threads never share one
+        conn_by_thread = {}
+        for thread, same_conn, conn in results:
+            self.assertIs(conn_by_thread.setdefault(thread, conn), conn)
+        conn_ids = {id(conn) for conn in conn_by_thread.values()}
+        self.assertEqual(len(conn_ids), len(conn_by_thread), "Threads shared connections")
+    
+    def test_finished_thread_connections(self):
+        """Test that connections of finished threads are never handed to new threads."""
+        conns = []
+        
+        def worker():
+            conns.append(self.db._get_connection())
+        
+        # Run the threads one after another so thread ids are likely to be reused
         for i in range(3):
-            thread = threading.Thread(target=worker, args=(i,))
-            threads.append(thread)
+            thread = threading.Thread(target=worker)
             thread.start()
-        
-        for thread in threads:
             thread.join()
         
-        # Each thread should have gotten the same connection for multiple calls
-        for thread_id, (same_conn, conn_id) in results.items():
-            self.assertTrue(same_conn, f"Thread {thread_id} got different connections")
+        self.assertEqual(len({id(conn) for conn in conns}), len(conns), "Threads shared connections")
         
-        # Different threads should have different connections
-        conn_ids = [conn_id for same_conn, conn_id in results.values()]
-        self.assertEqual(len(set(conn_ids)), len(conn_ids), "Threads shared connections")
+        # Connections of finished threads are released when a new one is created,
+        # so only the main thread and the last worker remain in the pool
+        self.assertEqual(len(self.db._connection_pool), 2)
 
 
-class TestDatabaseMigration(unittest.TestCase):
-    """Test cases for database migration functionality."""
+class TestDatabaseManagerInMemory(unittest.TestCase):
+    """Test cases for DatabaseManager that need no on-disk persistence."""
     
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.db_path = Path(self.temp_dir) / "migration_test.db"
+        self.db = DatabaseManager(":memory:")
     
     def tearDown(self):
         """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.db.close()
+    
+    def test_schema_creation(self):
+        """Test that database schema is created correctly."""
+        conn = self.db._get_connection()
+        
+        # Check that all tables exist
+        cursor = conn.execute("""
+            SELECT name FROM sqlite_master 
+            WHERE type='table' AND name NOT LIKE 'sqlite_%'
+        """)
+        tables = {row[0] for row in cursor}
+        
+        expected_tables = {
+            'app_state', 'conversations', 'db_metadata',
+            'message_attachments', 'messages', 'models'
+        }
+        self.assertEqual(tables, expected_tables)
+    
+    def test_schema_version(self):
+        """Test schema version management."""
+        # Initial version should be set to current schema version
+        version = self.db._get_schema_version()
+        self.assertEqual(version, self.db.SCHEMA_VERSION)
+        
+        # Test setting version
+        self.db._set_schema_version(2)
+        version = self.db._get_schema_version()
+        self.assertEqual(version, 2)
+    
+    def test_model_round_trip(self):
+        """Test that every model fixture survives a save and retrieve."""
+        for name, fixture in MODEL_FIXTURES.items():
+            with self.subTest(name=name):
+                self.db.save_model(make_model(name))
+                retrieved = self.db.get_model(name)
+                
+                self.assertIsNotNone(retrieved)
+                self.assertEqual(retrieved.size, fixture["size"])
+                self.assertEqual(retrieved.digest, fixture["digest"])
+                for field_name, value in fixture.get("details", {}).items():
+                    self.assertEqual(getattr(retrieved.details, field_name), value)
+                if "model_info" in fixture:
+                    self.assertIsNotNone(retrieved.model_info)
+                    for field_name, value in fixture["model_info"].items():
+                        self.assertEqual(getattr(retrieved.model_info, field_name), value)
+    
+    def test_shared_across_threads(self):
+        """Test that all threads see the same in-memory database."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(self.db.save_model, make_model("test-model")).result()
+            retrieved = executor.submit(self.db.get_model, "test-model").result()
+        
+        self.assertEqual(retrieved.digest, MODEL_FIXTURES["test-model"]["digest"])
+        self.assertIsNotNone(self.db.get_model("test-model"))
+        
+        # Another in-memory manager gets a database of its own
+        other_db = DatabaseManager(":memory:")
+        self.addCleanup(other_db.close)
+        self.assertIsNone(other_db.get_model("test-model"))
+    
+    def test_timestamps_parsed_to_datetime(self):
+        """Test that stored timestamps come back as datetime."""
+        conversation = ChatConversation(conversation_id="ts-conv", title="Timestamps")
+        conversation.add_message(ChatMessage(role=MessageRole.USER, content="Test", timestamp=FIXED_NOW))
+        conversation.created_at = conversation.updated_at = FIXED_NOW
+        self.db.save_conversation(conversation)
+        
+        self.assertEqual(self.db.list_conversations(), [("ts-conv", "Timestamps", FIXED_NOW)])
+        
+        retrieved = self.db.get_conversation("ts-conv")
+        self.assertEqual(retrieved.created_at, FIXED_NOW)
+        self.assertEqual(retrieved.updated_at, FIXED_NOW)
+        self.assertEqual(retrieved.messages[0].timestamp, FIXED_NOW)
+    
+    def test_invalid_conversation_timestamps_raise(self):
+        """Test that corrupt conversation and message timestamps are not replaced."""
+        conversation = ChatConversation(conversation_id="ts-conv", title="Timestamps")
+        conversation.add_message(ChatMessage(role=MessageRole.USER, content="Test", timestamp=FIXED_NOW))
+        
+        for table, column in (("conversations", "created_at"), ("messages", "timestamp")):
+            with self.subTest(table=table, column=column):
+                self.db.save_conversation(conversation)
+                with self.db.transaction() as conn:
+                    conn.execute(f"UPDATE {table} SET {column} = 'bogus'")
+                
+                with self.assertRaises(ValueError):
+                    self.db.get_conversation("ts-conv")
+    
+    def test_invalid_model_timestamp_falls_back(self):
+        """Test that a corrupt cached model timestamp falls back to a datetime."""
+        self.db.save_model(make_model("test-model"))
+        with self.db.transaction() as conn:
+            conn.execute("UPDATE models SET modified_at = 'bogus' WHERE name = ?", ("test-model",))
+        
+        retrieved = self.db.get_model("test-model")
+        self.assertIsInstance(retrieved.modified_at, datetime)
+
+
+class TestDatabaseMigration(unittest.TestCase):
+    """Test cases for database migration functionality."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.db_path = Path(temp_dir.name) / "migration_test.db"
     
     def test_migration_from_empty(self):
         """Test migration from empty database."""
@@ -8,7 +8,6 @@ import unittest
 import tempfile
 import os
 from pathlib import Path
-from unittest.mock import Mock, patch
 
 # Add src to path for testing
 import sys
@@ -46,24 +45,11 @@ class TestEmbeddingsManager(unittest.TestCase):
         # metadata might be None or empty dict depending on implementation
         self.assertTrue(doc.metadata is None or doc.metadata == {})
     
-    @patch('chromadb.Client')
-    def test_embeddings_manager_import(self, mock_chromadb):
+    def test_embeddings_manager_import(self):
         """Test that EmbeddingsManager can be imported."""
-        try:
-            from llamalot.backend.embeddings_manager import EmbeddingsManager
-            # If we get here, the import was successful
-            self.assertTrue(True)
-        except ImportError as e:
-            self.fail(f"Could not import EmbeddingsManager: {e}")
-    
-    def test_config_manager_import(self):
-        """Test that ConfigurationManager can be imported."""
-        try:
-            from llamalot.backend.config import ConfigurationManager
-            # If we get here, the import was successful
-            self.assertTrue(True)
-        except ImportError as e:
-            self.fail(f"Could not import ConfigurationManager: {e}")
+        # The module is already loaded for Document above, so this costs no extra imports
+        from llamalot.backend.embeddings_manager import EmbeddingsManager
+        self.assertTrue(callable(EmbeddingsManager))
 
 
 class TestEmbeddingsLogic(unittest.TestCase):
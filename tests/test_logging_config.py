@@ -0,0 +1,93 @@
+"""
+Tests for logging configuration functionality.
+"""
+
+import logging
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from llamalot.utils.logging_config import _BufferedRotatingFileHandler
+
+
+# Rotation threshold used by setup_logging
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+
+
+def make_record(message: str, level: int = logging.INFO) -> logging.LogRecord:
+    """Build a log record at the given level."""
+    return logging.makeLogRecord(dict(msg=message, levelno=level, levelname=logging.getLevelName(level)))
+
+
+class TestBufferedRotatingFileHandler(unittest.TestCase):
+    """Test cases for the buffered rotating log file handler."""
+    
+    def setUp(self):
+        """Set up a temporary log file."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.log_file = Path(temp_dir) / "test.log"
+    
+    def make_handler(self, max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = 2) -> _BufferedRotatingFileHandler:
+        """Build a handler on the temporary log file that is closed after the test."""
+        handler = _BufferedRotatingFileHandler(
+            str(self.log_file), maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.addCleanup(handler.close)
+        return handler
+    
+    def test_info_records_buffered_with_rotation(self):
+        """Test that info records stay buffered while rotation is enabled."""
+        handler = self.make_handler()
+        
+        for i in range(100):
+            handler.handle(make_record(f"info message {i}"))
+        
+        self.assertEqual(self.log_file.stat().st_size, 0)
+        
+        handler.close()
+        
+        lines = self.log_file.read_text(encoding='utf-8').splitlines()
+        self.assertEqual(lines, [f"info message {i}" for i in range(100)])
+    
+    def test_warning_flushes_buffer(self):
+        """Test that a warning flushes itself and the buffered records."""
+        handler = self.make_handler()
+        
+        handler.handle(make_record("info message"))
+        handler.handle(make_record("warning message", logging.WARNING))
+        
+        self.assertEqual(self.log_file.read_text(encoding='utf-8'), "info message\nwarning message\n")
+    
+    def test_rollover_uses_tracked_size(self):
+        """Test that rollover happens once the written records reach maxBytes."""
+        # Each record is 10 characters with its newline, so 3 fit under 35 bytes
+        handler = self.make_handler(max_bytes=35)
+        
+        for i in range(5):
+            handler.handle(make_record(f"message {i}"))
+        handler.close()
+        
+        backup_file = Path(f"{self.log_file}.1")
+        self.assertEqual(backup_file.read_text(encoding='utf-8').splitlines(),
+                         ["message 0", "message 1", "message 2"])
+        self.assertEqual(self.log_file.read_text(encoding='utf-8').splitlines(),
+                         ["message 3", "message 4"])
+    
+    def test_rollover_counts_existing_file(self):
+        """Test that an existing log file counts toward the rotation size."""
+        self.log_file.write_text("x" * 29 + "\n", encoding='utf-8')
+        handler = self.make_handler(max_bytes=35)
+        
+        handler.handle(make_record("message 0"))
+        handler.close()
+        
+        backup_file = Path(f"{self.log_file}.1")
+        self.assertEqual(backup_file.read_text(encoding='utf-8'), "x" * 29 + "\n")
+        self.assertEqual(self.log_file.read_text(encoding='utf-8'), "message 0\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
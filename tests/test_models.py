@@ -5,7 +5,7 @@ Tests for LlamaLot data models.
 import sys
 import os
 import unittest
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -16,6 +16,9 @@ from llamalot.models import (
     ApplicationConfig, OllamaServerConfig
 )
 
+# Fixed timestamp for fixtures, so tests don't depend on the wall clock
+FIXED_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
 
 class TestOllamaModel(unittest.TestCase):
     """Test OllamaModel data class."""
@@ -31,7 +34,7 @@ class TestOllamaModel(unittest.TestCase):
         
         model = OllamaModel(
             name="llama3:latest",
-            modified_at=datetime.now(),
+            modified_at=FIXED_NOW,
             size=3825819519,
             digest="fe938a131f40e6f6d40083c9f0f430a515233eb2edaa6d72eb85c50d64f2300e",
             details=details
@@ -63,12 +66,91 @@ class TestOllamaModel(unittest.TestCase):
         self.assertEqual(model.details.family, "llama")
         self.assertEqual(model.details.parameter_size, "13B")
         self.assertFalse(model.is_cached)
+        self.assertEqual(model.capabilities, ['completion'])
+    
+    def test_model_from_api_response_utc_timestamp(self):
+        """Test parsing a modified_at timestamp with a 'Z' UTC suffix."""
+        api_response = {
+            "model": "llama3:8b",
+            "modified_at": "2024-05-01T10:20:30Z",
+            "size": 4661224676,
+            "digest": "365c0bd3c000a25d28ddbf732fe1c6add414de7275464c4e4d1c3b5fcb5d8ad1",
+            "details": {}
+        }
+        
+        model = OllamaModel.from_list_response(api_response)
+        
+        self.assertEqual(model.modified_at, datetime(2024, 5, 1, 10, 20, 30, tzinfo=timezone.utc))
+    
+    def test_model_from_api_response_unexpected_timestamp_type(self):
+        """Test that a modified_at that is neither a string nor a datetime falls back to now."""
+        for modified_at in (1714558830, {"seconds": 1714558830}):
+            with self.subTest(modified_at=modified_at):
+                model = OllamaModel.from_list_response(
+                    {"model": "llama3:8b", "modified_at": modified_at, "size": 1, "digest": "a"},
+                    FIXED_NOW
+                )
+                
+                self.assertEqual(model.modified_at, FIXED_NOW)
+                self.assertEqual(model.to_dict()['modified_at'], FIXED_NOW.isoformat())
+    
+    def test_model_from_api_response_empty_name(self):
+        """Test that an entry without a name is rejected without logging an error."""
+        with self.assertLogs('llamalot.models.ollama_model', level='DEBUG') as logs:
+            with self.assertRaises(ValueError):
+                OllamaModel.from_list_response({"model": "", "name": "", "size": 1, "digest": "a"})
+        
+        self.assertEqual([record.levelname for record in logs.records], ["WARNING"])
+    
+    def test_models_from_tags_response(self):
+        """Test parsing a whole tags list, skipping entries without a name."""
+        models_data = [
+            {"model": "llama3:8b", "modified_at": "2024-05-01T10:20:30Z", "size": 1, "digest": "a"},
+            {"model": "", "name": "", "modified_at": "2024-05-01T10:20:30Z", "size": 2, "digest": "b"},
+            {"model": "phi3:mini", "modified_at": "2024-05-01T10:20:30Z", "size": 3, "digest": "c"},
+        ]
+        
+        with self.assertLogs('llamalot.models.ollama_model', level='DEBUG') as logs:
+            models = OllamaModel.from_tags_response(models_data)
+        
+        self.assertEqual([model.name for model in models], ["llama3:8b", "phi3:mini"])
+        self.assertIs(models[0].last_updated, models[1].last_updated)
+        
+        # The skipped entry is logged once
+        self.assertEqual([record.levelname for record in logs.records], ["WARNING"])
+    
+    def test_models_from_tags_response_unexpected_error(self):
+        """Test that an unexpected parse error is logged once and not swallowed."""
+        models_data = [{"model": "llama3:8b", "details": "not-a-dict", "size": 1, "digest": "a"}]
+        
+        with self.assertLogs('llamalot.models.ollama_model', level='DEBUG') as logs:
+            with self.assertRaises(AttributeError):
+                OllamaModel.from_tags_response(models_data)
+        
+        self.assertEqual([record.levelname for record in logs.records], ["ERROR"])
+    
+    def test_model_vision_capability_detection(self):
+        """Test that vision capability is detected from model families."""
+        api_response = {
+            "model": "llava:7b",
+            "modified_at": "2023-11-04T14:56:49.277302595-07:00",
+            "size": 4733363377,
+            "digest": "8dd30f6b0cb19f555f2c7a7ebda861449ea2cc76bf1f44e262931f45fc81d081",
+            "details": {
+                "family": "llama",
+                "families": ["llama", "clip"]
+            }
+        }
+        
+        model = OllamaModel.from_list_response(api_response)
+        
+        self.assertEqual(model.capabilities, ['completion', 'vision'])
     
     def test_model_serialization(self):
         """Test converting model to/from dictionary."""
         model = OllamaModel(
             name="test:latest",
-            modified_at=datetime.now(),
+            modified_at=FIXED_NOW,
             size=1000000,
             digest="abc123",
             details=ModelDetails(family="test")
@@ -81,6 +163,52 @@ class TestOllamaModel(unittest.TestCase):
         self.assertEqual(model.name, restored_model.name)
         self.assertEqual(model.size, restored_model.size)
         self.assertEqual(model.details.family, restored_model.details.family)
+    
+    def test_name_parts(self):
+        """Test short name and tag parsing, including names without a tag."""
+        model = OllamaModel(name="llama3:8b", modified_at=FIXED_NOW, size=0, digest="")
+        self.assertEqual(model.short_name, "llama3")
+        self.assertEqual(model.tag, "8b")
+        
+        untagged = OllamaModel(name="llama3", modified_at=FIXED_NOW, size=0, digest="")
+        self.assertEqual(untagged.short_name, "llama3")
+        self.assertEqual(untagged.tag, "latest")
+        
+        # The parts follow the current name
+        untagged.name = "mistral:7b"
+        self.assertEqual(untagged.short_name, "mistral")
+        self.assertEqual(untagged.tag, "7b")
+    
+    def test_size_human_readable(self):
+        """Test human-readable size formatting at unit boundaries."""
+        model = OllamaModel(name="test:latest", modified_at=FIXED_NOW, size=0, digest="abc123")
+        
+        expected = {
+            0: "Unknown",
+            1023: "1023.0 B",
+            1024: "1.0 KB",
+            1536: "1.5 KB",
+            1024 ** 3: "1.0 GB",
+            1024 ** 5: "1.0 PB",
+            1024 ** 6: "1024.0 PB",
+        }
+        for size, text in expected.items():
+            model.size = size
+            self.assertEqual(model.size_human_readable, text)
+    
+    @unittest.skipIf(sys.version_info < (3, 10), "dataclass slots require Python 3.10+")
+    def test_model_uses_slots(self):
+        """Test that model data classes do not carry a per-instance __dict__."""
+        model = OllamaModel(
+            name="test:latest",
+            modified_at=FIXED_NOW,
+            size=1000000,
+            digest="abc123"
+        )
+        
+        self.assertFalse(hasattr(model, '__dict__'))
+        self.assertFalse(hasattr(model.details, '__dict__'))
+        self.assertFalse(hasattr(ModelInfo(), '__dict__'))
 
 
 class TestChatMessage(unittest.TestCase):
@@ -198,6 +326,31 @@ class TestApplicationConfig(unittest.TestCase):
         self.assertEqual(config.ollama_server.host, restored_config.ollama_server.host)
         self.assertEqual(config.ui_preferences.window_width, restored_config.ui_preferences.window_width)
     
+    def test_config_serialization_round_trip(self):
+        """Test that every setting survives a to_dict/from_dict round trip."""
+        config = ApplicationConfig()
+        config.ui_preferences.use_ai_generated_titles = False
+        config.embeddings.active_collections = ["docs"]
+        config.chat_defaults.default_system_prompt = "Be brief"
+        
+        restored_config = ApplicationConfig.from_dict(config.to_dict())
+        
+        self.assertEqual(restored_config, config)
+    
+    def test_config_from_partial_dict(self):
+        """Test that missing settings use defaults and unknown settings are ignored."""
+        config = ApplicationConfig.from_dict({
+            'ollama_server': {'host': 'example.com', 'unknown_option': 1},
+            'ui_preferences': {'theme': 'dark'},
+        })
+        
+        self.assertEqual(config.ollama_server.host, 'example.com')
+        self.assertEqual(config.ollama_server.port, 11434)
+        self.assertEqual(config.ui_preferences.theme, 'dark')
+        self.assertEqual(config.ui_preferences.window_width, 1200)
+        self.assertEqual(config.embeddings.active_collections, [])
+        self.assertEqual(config.cache_expiry_hours, 24)
+    
     def test_server_urls(self):
         """Test server URL generation."""
         config = OllamaServerConfig(host="example.com", port=8080, use_https=True)
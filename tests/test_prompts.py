@@ -4,10 +4,10 @@ Tests for the prompts system including data models and manager functionality.
 
 import unittest
 import tempfile
-import shutil
 import json
 import os
 from pathlib import Path
+from unittest.mock import patch
 
 from llamalot.models.prompts import BasePrompt, ExtraPrompt, PromptsConfig
 from llamalot.backend.prompts_manager import PromptsManager
@@ -82,19 +82,76 @@ class TestPromptsModels(unittest.TestCase):
         
         self.assertEqual(len(config.base_prompts), 1)
         self.assertEqual(len(config.extra_prompts), 1)
+        self.assertEqual(config.categories, ["test"])
+    
+    def test_prompts_config_category_tracking(self):
+        """Test that categories follow prompt additions, updates and removals."""
+        config = PromptsConfig()
+        config.add_base_prompt(BasePrompt(id="base1", name="Base 1", category="b", input_type="text", prompt="1"))
+        config.add_base_prompt(BasePrompt(id="base2", name="Base 2", category="a", input_type="text", prompt="2"))
+        config.add_extra_prompt(ExtraPrompt(id="extra1", name="Extra 1", category="a", type="boolean", prompt="3"))
+        self.assertEqual(config.categories, ["a", "b"])
+        
+        # Category "a" is still used by the extra prompt
+        config.update_base_prompt(BasePrompt(id="base2", name="Base 2", category="c", input_type="text", prompt="2"))
+        self.assertEqual(config.categories, ["a", "b", "c"])
+        self.assertEqual(config.get_base_prompts_by_category("a"), [])
+        self.assertEqual([p.id for p in config.get_base_prompts_by_category("c")], ["base2"])
+        self.assertEqual([p.id for p in config.get_extra_prompts_by_category("a")], ["extra1"])
+        
+        config.remove_extra_prompt("extra1")
+        self.assertEqual(config.categories, ["b", "c"])
+        
+        config.remove_base_prompt("base1")
+        config.remove_base_prompt("base2")
+        self.assertEqual(config.categories, [])
+    
+    def test_from_json_file_non_string_fields(self):
+        """Test that a null category or type doesn't stop the file from loading."""
+        data = {
+            "base": {"base1": {"name": "Base 1", "category": None, "prompt": "1"}},
+            "extra": {"extra1": {"name": "Extra 1", "category": None, "type": None, "prompt": "2"}},
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "prompts.json")
+            Path(file_path).write_text(json.dumps(data))
+            config = PromptsConfig.from_json_file(file_path)
+        
+        self.assertEqual(list(config.base_prompts), ["base1"])
+        self.assertEqual(list(config.extra_prompts), ["extra1"])
+        self.assertIsNone(config.base_prompts["base1"].category)
+        self.assertIsNone(config.extra_prompts["extra1"].type)
+    
+    def test_prompts_config_given_categories_sorted(self):
+        """Test that explicitly given categories are sorted before new ones are inserted."""
+        config = PromptsConfig(categories=["c", "a", "c"])
+        self.assertEqual(config.categories, ["a", "c"])
+        
+        config.add_base_prompt(BasePrompt(id="base1", name="Base 1", category="b", input_type="text", prompt="1"))
+        self.assertEqual(config.categories, ["a", "b", "c"])
 
 
 class TestPromptsManager(unittest.TestCase):
     """Test prompts manager functionality."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary directory and manager shared by all tests in the class."""
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls.temp_dir = cls._temp_dir.name
+        cls.manager = PromptsManager(cls.temp_dir)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared temporary directory."""
+        cls._temp_dir.cleanup()
+    
     def setUp(self):
         """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.manager = PromptsManager(self.temp_dir)
-    
-    def tearDown(self):
-        """Clean up test environment."""
-        shutil.rmtree(self.temp_dir)
+        # Drop whatever the previous test saved and reload, as a new manager would
+        for entry in os.scandir(self.temp_dir):
+            os.unlink(entry.path)
+        self.manager.load_config()
     
     def test_manager_initialization(self):
         """Test manager initialization."""
@@ -159,6 +216,30 @@ class TestPromptsManager(unittest.TestCase):
         cat1_extra = self.manager.get_extra_prompts_by_category("category1")
         self.assertEqual(len(cat1_extra), 1)
         self.assertEqual(cat1_extra[0].name, "Extra 1")
+    
+    def test_unchanged_save_skips_write(self):
+        """Test that saving an unchanged config does not rewrite the file."""
+        file_path = os.path.join(self.temp_dir, "prompts.json")
+        config = PromptsConfig()
+        config.add_base_prompt(BasePrompt(id="base1", name="Base 1", category="a", input_type="text", prompt="1"))
+        self.assertTrue(config.to_json_file(file_path))
+        saved_text = Path(file_path).read_text()
+        
+        # An unchanged save of an untouched file writes nothing
+        with patch('llamalot.models.prompts.atomic_write_bytes') as mock_write:
+            self.assertTrue(config.to_json_file(file_path))
+        mock_write.assert_not_called()
+        
+        # A file modified behind the config's back is written again
+        Path(file_path).write_text("marker")
+        self.assertTrue(config.to_json_file(file_path))
+        self.assertEqual(Path(file_path).read_text(), saved_text)
+        
+        # A changed config is written again
+        config.remove_base_prompt("base1")
+        self.assertTrue(config.to_json_file(file_path))
+        self.assertEqual(json.loads(Path(file_path).read_text())['base'], {})
+        self.assertFalse(os.path.exists(file_path + ".tmp"))
 
 
 if __name__ == '__main__':
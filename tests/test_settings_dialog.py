@@ -3,8 +3,8 @@
 Unit tests for settings dialog functionality.
 """
 
+import importlib.util
 import unittest
-from unittest.mock import Mock, patch
 from pathlib import Path
 
 # Add src to path for testing
@@ -52,9 +52,9 @@ class TestSettingsDialog(unittest.TestCase):
         self.assertEqual(config.ollama_server.timeout, 240)
         self.assertEqual(config.ollama_server.effective_timeout, 240)
     
-    @patch('wx.App')
-    @patch('wx.Frame')
-    def test_settings_dialog_import(self, mock_frame, mock_app):
+    # Importing the dialogs package loads wxPython, so only run where it is installed
+    @unittest.skipUnless(importlib.util.find_spec('wx'), "wxPython not installed")
+    def test_settings_dialog_import(self):
         """Test that SettingsDialog can be imported without GUI."""
         try:
             from llamalot.gui.dialogs.settings_dialog import SettingsDialog